@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Catalog memory benchmark
+Compares the dict catalog with compact RestaurantRecords (CATALOG_COMPACT=1) at production scale
+
+Usage: python benchmark_catalog_memory.py [restaurant_count]
+"""
+
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+
+logging.disable(logging.CRITICAL)
+
+from catalog_records import compact_restaurant
+from mock_data import RESTAURANTS, load_catalog
+
+
+def synthetic_catalog(count: int):
+    """`count` restaurants cloned from the mock catalog, as freshly built dicts with unique ids/names"""
+    catalog = []
+    for n in range(count):
+        template = RESTAURANTS[n % len(RESTAURANTS)]
+        restaurant = {key: value for key, value in template.items()}
+        # Re-create strings as a JSON/DB loader would, so nothing is shared by accident
+        for key in ("cuisine", "price_range", "delivery_time"):
+            restaurant[key] = "".join(restaurant[key])
+        restaurant["id"] = f"rest_{n:07d}"
+        restaurant["name"] = f"{template['name']} #{n}"
+        restaurant["image_url"] = f"https://example.com/{n}.jpg"
+        restaurant["location"] = {key: "".join(value) if isinstance(value, str) else value
+                                  for key, value in template["location"].items()}
+        restaurant["location"]["address"] = f"{n} {template['location']['address']}"
+        catalog.append(restaurant)
+    return catalog
+
+
+def measure(build):
+    """(result, bytes allocated and still held, seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Catalog memory: {count:,} restaurants")
+    # With CATALOG_LAZY=1 the catalog is empty until it is first loaded
+    load_catalog()
+
+    dicts, dict_bytes, dict_seconds = measure(lambda: synthetic_catalog(count))
+    records, record_bytes, record_seconds = measure(lambda: [compact_restaurant(r) for r in synthetic_catalog(count)])
+    assert all(dict(record) == restaurant for record, restaurant in zip(records[:1000], dicts))
+
+    print(f"  dicts:   {dict_bytes / 2**20:8.1f} MiB  {dict_bytes / count:6.0f} B/restaurant  built in {dict_seconds:.2f}s")
+    print(f"  records: {record_bytes / 2**20:8.1f} MiB  {record_bytes / count:6.0f} B/restaurant  built in {record_seconds:.2f}s")
+    print(f"  saved:   {(dict_bytes - record_bytes) / 2**20:8.1f} MiB  ({1 - record_bytes / dict_bytes:.0%})")
+
+    # Lookup cost: the hot path reads a few fields per record
+    for label, catalog in (("dicts", dicts), ("records", records)):
+        started = time.perf_counter()
+        for restaurant in catalog:
+            restaurant["id"], restaurant.get("rating"), restaurant["location"]["city"]
+        elapsed = time.perf_counter() - started
+        print(f"  {label} field reads: {elapsed / count * 1e9:6.0f} ns/restaurant")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Response path benchmark
+Default JSONResponse + response_model validation vs FAST_JSON=1 (orjson, trusted records sent as-is)
+
+Usage: python benchmark_responses.py [requests]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Runs once per mode in a fresh interpreter (FAST_JSON is read at import);
+# requests go straight into the ASGI app (no sockets), so client overhead stays small
+PROBE = r"""
+import asyncio, json, logging, sys, time
+logging.disable(logging.CRITICAL)
+import httpx
+import main
+
+CLIENT = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench")
+
+async def call(path, query=""):
+    response = await CLIENT.get(path + ("?" + query if query else ""))
+    return response.content
+
+CASES = {
+    "get_menu (cached)": ("/api/v1/restaurants/rest_001/menu", ""),
+    "get_menu (cache miss)": ("/api/v1/restaurants/rest_001/menu", ""),
+    "search_restaurants (all)": ("/api/v1/restaurants/search", ""),
+    "search_restaurants (city)": ("/api/v1/restaurants/search", "city=San%20Francisco"),
+    "search_restaurants (nearest 10)": ("/api/v1/restaurants/search", "lat=37.77&lng=-122.41&limit=10"),
+}
+
+async def run(count):
+    results = {}
+    for name, (path, query) in CASES.items():
+        miss = "miss" in name
+        for _ in range(50):
+            await call(path, query)
+        started = time.perf_counter()
+        for _ in range(count):
+            if miss:
+                main.CATALOG_RESPONSES.clear()
+            body = await call(path, query)
+        results[name] = {"us": (time.perf_counter() - started) / count * 1e6, "bytes": len(body)}
+    print(json.dumps(results))
+
+asyncio.run(run(int(sys.argv[1])))
+"""
+
+MODES = {"default": {"FAST_JSON": "0"}, "FAST_JSON=1": {"FAST_JSON": "1"}}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for mode, env in MODES.items():
+        output = subprocess.run([sys.executable, "-c", PROBE, str(count)], env=dict(os.environ, **env), cwd=here,
+                                capture_output=True, text=True, check=True).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    default, fast = results["default"], results["FAST_JSON=1"]
+    print(f"Per request through the ASGI app, {count} requests each, microseconds")
+    print(f"{'endpoint':<34}{'bytes':>8}{'default':>10}{'FAST_JSON':>11}{'speedup':>9}")
+    for name in default:
+        print(f"{name:<34}{default[name]['bytes']:>8}{default[name]['us']:>10.1f}{fast[name]['us']:>11.1f}"
+              f"{default[name]['us'] / fast[name]['us']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
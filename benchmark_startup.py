@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark
+Time from a fresh interpreter to the first response, for each catalog loading mode
+
+Usage: python benchmark_startup.py [runs] [--no-pyc]
+  --no-pyc   compile every module from source, like a cold start without bytecode caches
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Runs in a fresh interpreter per sample; prints one JSON line of timings in ms
+PROBE = r"""
+import json, logging, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+logging.disable(logging.CRITICAL)
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    client.get("/health")
+    health = time.perf_counter()
+    client.get("/api/v1/restaurants/rest_001/menu")
+    menu = time.perf_counter()
+    client.get("/api/v1/search/intelligent", params={"query": "spicy food under $15", "location": "San Francisco"})
+    search = time.perf_counter()
+ms = lambda a, b: round((b - a) * 1000, 2)
+print(json.dumps({
+    "import main": ms(started, imported),
+    "first /health": ms(ready, health),
+    "first menu": ms(health, menu),
+    "first search": ms(menu, search),
+    "to first menu": ms(started, menu) - ms(imported, ready),
+}))
+"""
+
+MODES = {
+    "eager": {"CATALOG_LAZY": "0"},
+    "lazy": {"CATALOG_LAZY": "1"},
+}
+
+
+def sample(env, no_pyc):
+    env = dict(os.environ, **env)
+    env.pop("VERCEL", None)
+    with tempfile.TemporaryDirectory() as cache:
+        if no_pyc:
+            env["PYTHONPYCACHEPREFIX"] = cache
+        output = subprocess.run([sys.executable, "-c", PROBE], env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    runs = int(args[0]) if args else 5
+    no_pyc = "--no-pyc" in sys.argv
+
+    modes = dict(MODES)
+    with tempfile.TemporaryDirectory() as workdir:
+        snapshot = os.path.join(workdir, "catalog.snap")
+        subprocess.run([sys.executable, "catalog_snapshot.py", snapshot], check=True, capture_output=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        modes["lazy + snapshot"] = {"CATALOG_LAZY": "1", "CATALOG_SNAPSHOT": snapshot}
+
+        print(f"Cold start, median of {runs} runs{' (no bytecode cache)' if no_pyc else ''}, ms")
+        results = {}
+        for name, env in modes.items():
+            samples = [sample(env, no_pyc) for _ in range(runs)]
+            results[name] = {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+    columns = list(next(iter(results.values())))
+    print(f"{'mode':<18}" + "".join(f"{column:>16}" for column in columns))
+    for name, timings in results.items():
+        print(f"{name:<18}" + "".join(f"{timings[column]:>16.1f}" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
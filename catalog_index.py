@@ -0,0 +1,331 @@
+"""
+Catalog index for restaurant lookups
+Built once from the restaurant list and kept in sync on every catalog mutation
+"""
+
+import heapq
+import re
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+from geo_index import GeoIndex
+
+
+def normalize_key(value: Any) -> Any:
+    """Normalize a filter value for case-insensitive lookups (booleans pass through)"""
+    if isinstance(value, str):
+        return value.lower()
+    return value
+
+
+_DELIVERY_RANGE_PATTERN = re.compile(r'(\d+)-(\d+)')
+
+
+def parse_delivery_time(delivery_time: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Minimum and maximum minutes from strings like '30-45 min' (None when unparseable)"""
+    try:
+        minimum = int(delivery_time.split('-')[0].strip().split(' ')[0])
+    except (AttributeError, ValueError):
+        minimum = None
+    match = _DELIVERY_RANGE_PATTERN.search(delivery_time or "")
+    maximum = int(match.group(2)) if match else None
+    return minimum, maximum
+
+
+def intersect_sorted(left: List[int], right: List[int]) -> List[int]:
+    """Intersect two ascending lists of ordinals, keeping ascending order"""
+    if len(left) > len(right):
+        left, right = right, left
+    if not left:
+        return []
+    # Skewed sizes: binary-search each element of the short list in the long one
+    if len(right) > 8 * len(left):
+        result = []
+        low = 0
+        for value in left:
+            low = bisect_left(right, value, low)
+            if low == len(right):
+                break
+            if right[low] == value:
+                result.append(value)
+        return result
+    # Similar sizes: linear merge
+    result = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        a, b = left[i], right[j]
+        if a == b:
+            result.append(a)
+            i += 1
+            j += 1
+        elif a < b:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+class CatalogIndex:
+    """
+    In-memory indexes over the restaurant catalog.
+
+    Every restaurant gets an ordinal when it is indexed. Ordinals only grow, so
+    sorting by ordinal reproduces catalog order, and the posting lists (sorted
+    ordinals) can be intersected without losing that order.
+    """
+
+    # Filterable fields and how to read them from a restaurant record
+    FIELDS = {
+        "city": lambda r: r.get("location", {}).get("city"),
+        "cuisine": lambda r: r.get("cuisine"),
+        "price_range": lambda r: r.get("price_range"),
+        "is_open": lambda r: r.get("is_open"),
+    }
+
+    # Presorted orderings: sort key per ordinal (ties fall back to catalog order)
+    ORDERINGS = ("rating", "delivery")
+
+    def __init__(self, restaurants: List[Dict]):
+        self.version = 0
+        self._geo: Optional[GeoIndex] = None
+        self._geo_version = -1
+        self._orderings: Dict[str, Tuple[List[int], Dict[int, int], List]] = {}
+        self._orderings_version = -1
+        self.rebuild(restaurants)
+
+    def rebuild(self, restaurants: List[Dict]):
+        """Drop every index and rebuild it from the given restaurant list"""
+        self._next_ordinal = 0
+        self._records: Dict[int, Dict] = {}
+        self._ordinals: Dict[str, int] = {}
+        self._keys: Dict[int, List[Tuple]] = {}
+        # Delivery times parsed once from "30-45 min" strings, keyed by ordinal
+        self.delivery_min_minutes: Dict[int, Optional[int]] = {}
+        self.delivery_max_minutes: Dict[int, Optional[int]] = {}
+        self.postings: Dict[str, Dict[Any, List[int]]] = {field: {} for field in self.FIELDS}
+        self.by_city_cuisine: Dict[Tuple[str, str], List[int]] = {}
+        for restaurant in restaurants:
+            self._file(restaurant, self._allocate_ordinal())
+        self.version += 1
+
+    @property
+    def by_city(self) -> Dict[str, List[int]]:
+        return self.postings["city"]
+
+    @property
+    def by_cuisine(self) -> Dict[str, List[int]]:
+        return self.postings["cuisine"]
+
+    # Mutations
+
+    def add(self, restaurant: Dict):
+        """Index a new restaurant, or re-index it in place if the ID already exists"""
+        ordinal = self._ordinals.get(restaurant["id"])
+        if ordinal is None:
+            ordinal = self._allocate_ordinal()
+        else:
+            self._unfile(ordinal)
+        self._file(restaurant, ordinal)
+        self.version += 1
+
+    def remove(self, restaurant_id: str) -> Optional[Dict]:
+        """Remove a restaurant from every index and return its record"""
+        ordinal = self._ordinals.pop(restaurant_id, None)
+        if ordinal is None:
+            return None
+        self._unfile(ordinal)
+        restaurant = self._records.pop(ordinal)
+        del self.delivery_min_minutes[ordinal]
+        del self.delivery_max_minutes[ordinal]
+        self.version += 1
+        return restaurant
+
+    # Lookups
+
+    def get(self, restaurant_id: str) -> Optional[Dict]:
+        """Get a restaurant record by ID"""
+        ordinal = self._ordinals.get(restaurant_id)
+        if ordinal is None:
+            return None
+        return self._records[ordinal]
+
+    def ordinal(self, restaurant_id: str) -> Optional[int]:
+        """Catalog ordinal of a restaurant (smaller means earlier in the catalog)"""
+        return self._ordinals.get(restaurant_id)
+
+    def record(self, ordinal: int) -> Dict:
+        """Restaurant record for an ordinal"""
+        return self._records[ordinal]
+
+    def match(self, **filters) -> Optional[List[int]]:
+        """
+        Ordinals matching every non-empty filter, in catalog order.
+
+        Filters are the keys of FIELDS. Returns None when no filter is set,
+        meaning "the whole catalog", so callers can skip materializing it.
+        """
+        for field in filters:
+            if field not in self.FIELDS:
+                raise ValueError(f"Unknown catalog filter: {field}")
+        active = {k: v for k, v in filters.items() if v is not None and v != ""}
+        lists = []
+        if active.get("city") and active.get("cuisine"):
+            key = (normalize_key(active.pop("city")), normalize_key(active.pop("cuisine")))
+            lists.append(self.by_city_cuisine.get(key, []))
+        for field, value in active.items():
+            lists.append(self.postings[field].get(normalize_key(value), []))
+        if not lists:
+            return None
+        # Intersect smallest-first so intermediate results shrink quickly
+        lists.sort(key=len)
+        result = lists[0]
+        for postings in lists[1:]:
+            if not result:
+                break
+            result = intersect_sorted(result, postings)
+        return result
+
+    def query(self, **filters) -> List[Dict]:
+        """Restaurant records matching every non-empty filter, in catalog order"""
+        ordinals = self.match(**filters)
+        if ordinals is None:
+            return list(self._records.values())
+        records = self._records
+        return [records[o] for o in ordinals]
+
+    def geo(self) -> GeoIndex:
+        """Spatial index keyed by ordinal, rebuilt lazily after catalog mutations"""
+        if self._geo is None or self._geo_version != self.version:
+            self._geo = GeoIndex(
+                (ordinal, r.get("location", {}).get("lat"), r.get("location", {}).get("lng"))
+                for ordinal, r in self._records.items()
+            )
+            self._geo_version = self.version
+        return self._geo
+
+    def delivery_minutes(self, restaurant_id: str) -> Tuple[Optional[int], Optional[int]]:
+        """Parsed (min, max) delivery minutes for a restaurant"""
+        ordinal = self._ordinals.get(restaurant_id)
+        if ordinal is None:
+            return None, None
+        return self.delivery_min_minutes[ordinal], self.delivery_max_minutes[ordinal]
+
+    def ordering(self, by: str) -> Tuple[List[int], Dict[int, int]]:
+        """
+        Ordinals presorted by "rating" (highest first) or "delivery" (fastest
+        minimum delivery time first, unparseable last), plus each ordinal's rank
+        in that order. Rebuilt lazily after catalog mutations.
+        """
+        ordinals, ranks, _ = self._ordering(by)
+        return ordinals, ranks
+
+    def fastest(self, max_minutes: int) -> List[int]:
+        """Ordinals whose minimum delivery time is at most max_minutes, fastest first (a range scan)"""
+        ordinals, _, keys = self._ordering("delivery")
+        return ordinals[:bisect_right(keys, (False, max_minutes, float("inf")))]
+
+    def filter_delivery_within(self, records: List[Dict], max_minutes: int) -> List[Dict]:
+        """Catalog records whose minimum delivery time is at most max_minutes, in their given order"""
+        ordinals, _, keys = self._ordering("delivery")
+        cut = bisect_right(keys, (False, max_minutes, float("inf")))
+        positions = self._ordinals
+        if cut < len(records):
+            # Few fast restaurants: range-scan them instead of checking every record
+            fast = set(ordinals[:cut])
+            return [r for r in records if positions.get(r["id"]) in fast]
+        minimums = self.delivery_min_minutes
+        result = []
+        for r in records:
+            minimum = minimums.get(positions.get(r["id"]))
+            if minimum is not None and minimum <= max_minutes:
+                result.append(r)
+        return result
+
+    def sort_records(self, records: List[Dict], by: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Sort catalog records by a presorted ordering (ties keep catalog order).
+        With a limit, only the first `limit` records are selected, without a full sort.
+        """
+        ordinals, ranks, _ = self._ordering(by)
+        positions = self._ordinals
+        count = len(records) if limit is None else min(limit, len(records))
+        if count <= 0:
+            return []
+        # Large subsets: walk the presorted order (stopping early once enough are found)
+        if len(records) * max(1, count.bit_length()) > len(ordinals):
+            by_ordinal = {positions[r["id"]]: r for r in records}
+            selected = []
+            for ordinal in ordinals:
+                record = by_ordinal.get(ordinal)
+                if record is not None:
+                    selected.append(record)
+                    if len(selected) == count:
+                        break
+            return selected
+        key = lambda r: ranks[positions[r["id"]]]
+        if count < len(records):
+            # Partial selection: O(n log k) heap instead of O(n log n) sort
+            return heapq.nsmallest(count, records, key=key)
+        return sorted(records, key=key)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, restaurant_id: str):
+        return restaurant_id in self._ordinals
+
+    # Internals
+
+    def _ordering(self, by: str) -> Tuple[List[int], Dict[int, int], List]:
+        if by not in self.ORDERINGS:
+            raise ValueError(f"Unknown catalog ordering: {by}")
+        if self._orderings_version != self.version:
+            self._orderings = {}
+            self._orderings_version = self.version
+        cached = self._orderings.get(by)
+        if cached is None:
+            if by == "rating":
+                keyed = [(-(r.get("rating") or 0), o) for o, r in self._records.items()]
+            else:
+                keyed = [(m is None, m or 0, o) for o, m in self.delivery_min_minutes.items()]
+            keyed.sort()
+            ordinals = [key[-1] for key in keyed]
+            ranks = {ordinal: rank for rank, ordinal in enumerate(ordinals)}
+            cached = self._orderings[by] = (ordinals, ranks, keyed)
+        return cached
+
+    def _allocate_ordinal(self) -> int:
+        ordinal = self._next_ordinal
+        self._next_ordinal += 1
+        return ordinal
+
+    def _posting_keys(self, restaurant: Dict) -> List[Tuple]:
+        values = {field: normalize_key(getter(restaurant)) for field, getter in self.FIELDS.items()}
+        keys = [(self.postings[field], value) for field, value in values.items()]
+        keys.append((self.by_city_cuisine, (values["city"], values["cuisine"])))
+        return keys
+
+    def _file(self, restaurant: Dict, ordinal: int):
+        # Keys are remembered per ordinal so a record mutated in place can
+        # still be removed from the postings it was filed under.
+        # _records keeps ordinal order because re-adds reuse their slot.
+        keys = self._posting_keys(restaurant)
+        self._records[ordinal] = restaurant
+        self._ordinals[restaurant["id"]] = ordinal
+        self._keys[ordinal] = keys
+        minimum, maximum = parse_delivery_time(restaurant.get("delivery_time"))
+        self.delivery_min_minutes[ordinal] = minimum
+        self.delivery_max_minutes[ordinal] = maximum
+        for index, key in keys:
+            insort(index.setdefault(key, []), ordinal)
+
+    def _unfile(self, ordinal: int):
+        for index, key in self._keys.pop(ordinal):
+            postings = index.get(key)
+            if not postings:
+                continue
+            position = bisect_left(postings, ordinal)
+            if position < len(postings) and postings[position] == ordinal:
+                del postings[position]
+            if not postings:
+                del index[key]
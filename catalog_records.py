@@ -0,0 +1,129 @@
+"""
+Compact restaurant catalog records
+__slots__ records that behave like the catalog's dicts at a fraction of their memory
+"""
+
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Marks a field the source dict did not have, so `in`, len() and iteration match it
+_MISSING = object()
+
+
+class _SlotRecord(MutableMapping):
+    """
+    A dict-like record with a fixed set of fields stored in __slots__.
+
+    Reads, `in`, iteration, dict(record), {**record} and update() behave like
+    the dict it was built from, so existing lookups and response models accept
+    it unchanged. Keys outside FIELDS go to a small overflow dict. Repeated
+    strings in INTERNED fields are interned, so every record shares one copy.
+    """
+
+    __slots__ = ("_extra",)
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED = frozenset()
+    NESTED: Dict[str, type] = {}
+
+    def __init__(self, data: Optional[Mapping] = None):
+        self._extra: Optional[Dict[str, Any]] = None
+        for field in self.FIELDS:
+            setattr(self, field, _MISSING)
+        if data:
+            for key, value in data.items():
+                self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Overrides Mapping.get, which goes through __getitem__ and a try/except
+        if key in self._field_set:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._field_set:
+            nested = self.NESTED.get(key)
+            if nested is not None and isinstance(value, Mapping) and not isinstance(value, nested):
+                value = nested(value)
+            elif key in self.INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in self._field_set and getattr(self, key) is not _MISSING:
+            setattr(self, key, _MISSING)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self.FIELDS:
+            if getattr(self, field) is not _MISSING:
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        count = sum(1 for field in self.FIELDS if getattr(self, field) is not _MISSING)
+        return count + len(self._extra or ())
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._field_set:
+            return getattr(self, key) is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def copy(self) -> Dict[str, Any]:
+        """Shallow copy as a plain dict, like dict.copy()"""
+        return dict(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Deep copy as plain dicts (for JSON encoders that only accept dicts)"""
+        return {key: value.to_dict() if isinstance(value, _SlotRecord) else value
+                for key, value in self.items()}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+
+class LocationRecord(_SlotRecord):
+    """A restaurant's location (the "location" sub-dict)"""
+    FIELDS = ("address", "city", "state", "zip", "lat", "lng")
+    __slots__ = FIELDS
+    INTERNED = frozenset({"city", "state", "zip"})
+
+
+class RestaurantRecord(_SlotRecord):
+    """A restaurant catalog entry"""
+    FIELDS = ("id", "name", "cuisine", "location", "rating", "price_range", "delivery_time",
+              "minimum_order", "delivery_fee", "is_open", "image_url")
+    __slots__ = FIELDS
+    INTERNED = frozenset({"cuisine", "price_range", "delivery_time"})
+    NESTED = {"location": LocationRecord}
+
+
+def compact_restaurant(restaurant: Mapping) -> RestaurantRecord:
+    """The restaurant as a RestaurantRecord (returned as-is if it already is one)"""
+    if isinstance(restaurant, RestaurantRecord):
+        return restaurant
+    return RestaurantRecord(restaurant)
@@ -0,0 +1,515 @@
+"""
+Catalog snapshot
+The restaurant catalog as one read-only binary file, memory-mapped and shared by every worker
+
+Build it with:  python catalog_snapshot.py catalog.snap
+Serve from it:  CATALOG_SNAPSHOT=catalog.snap uvicorn main:app --workers N
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"FOODCAT1"
+FORMAT_VERSION = 2
+
+# magic, version, restaurant/string/menu/item counts, then section offsets:
+# string index, string data, restaurant records, restaurant id index, menu
+# directory, menu id index, menu data, menu item rows, menu item data
+_HEADER = struct.Struct("<8sIIIII" + "Q" * 9)
+
+# Field order of a restaurant dict, and of its "location" sub-dict
+FIELDS = ("id", "name", "cuisine", "location", "rating", "price_range", "delivery_time",
+          "minimum_order", "delivery_fee", "is_open", "image_url")
+LOCATION_FIELDS = ("address", "city", "state", "zip", "lat", "lng")
+
+# Restaurant record (fixed width): columns with a present bit and a null bit
+# each, string columns as string table numbers, then float columns, is_open,
+# and the string number of a JSON object holding every value that does not fit
+# a column (other keys, or unexpected types)
+_STRING_COLUMNS = ("id", "name", "cuisine", "address", "city", "state", "zip",
+                   "price_range", "delivery_time", "image_url")
+_FLOAT_COLUMNS = ("lat", "lng", "rating", "minimum_order", "delivery_fee")
+_COLUMNS = _STRING_COLUMNS + _FLOAT_COLUMNS + ("is_open",)
+_BITS = {name: 1 << bit for bit, name in enumerate(_COLUMNS)}
+_RECORD = struct.Struct("<II" + "I" * len(_STRING_COLUMNS) + "d" * len(_FLOAT_COLUMNS) + "?3xI")
+_FLOATS_AT = 2 + len(_STRING_COLUMNS)
+_IS_OPEN_AT = _FLOATS_AT + len(_FLOAT_COLUMNS)
+# Where each column sits in an unpacked record, and which fields it can hold
+_COLUMN_AT = {name: 2 + position for position, name in enumerate(_STRING_COLUMNS)}
+_COLUMN_AT.update((name, _FLOATS_AT + position) for position, name in enumerate(_FLOAT_COLUMNS))
+_COLUMN_AT["is_open"] = _IS_OPEN_AT
+_STRINGS = frozenset(_STRING_COLUMNS)
+_LOCATION_COLUMNS = frozenset(LOCATION_FIELDS)
+_RESTAURANT_COLUMNS = frozenset(_COLUMNS) - _LOCATION_COLUMNS
+_LOCATION_BITS = sum(_BITS[name] for name in LOCATION_FIELDS)
+_FIELD_SET = frozenset(FIELDS)
+
+_STRING_ENTRY = struct.Struct("<QI4x")
+# Restaurant id string number, menu JSON length and offset, first item row, item count
+_MENU_ENTRY = struct.Struct("<IIQII")
+# Menu item row: the columns intelligent search indexes (name and category as
+# string numbers, flags, price), then where the item's own JSON is stored
+_ITEM = struct.Struct("<IIIB3xdQ")
+_SPICY = 1
+_VEGETARIAN = 2
+_ORDINAL = struct.Struct("<I")
+_NONE = 0xFFFFFFFF
+
+# A field the record does not have, and a field deleted from a SnapshotRestaurant
+_ABSENT = object()
+_DELETED = object()
+
+
+class SnapshotError(ValueError):
+    """The file is not a catalog snapshot this code can read"""
+
+
+class _StringTable:
+    """Deduplicated strings, numbered in first-seen order"""
+
+    def __init__(self):
+        self.strings: List[bytes] = []
+        self._numbers: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        number = self._numbers.get(value)
+        if number is None:
+            number = self._numbers[value] = len(self.strings)
+            self.strings.append(value.encode("utf-8"))
+        return number
+
+
+def _place(name: str, value: Any, columns: frozenset, extra_key: str, row: Dict, extra: Dict):
+    # Into its column when it has one and the value has the column's type,
+    # else kept exactly in the JSON extras
+    if name in columns:
+        kind = str if name in _STRINGS else bool if name == "is_open" else float
+        if value is None or type(value) is kind:
+            row[name] = value
+            return
+    extra[extra_key] = value
+
+
+def _pack_restaurant(restaurant: Mapping, strings: _StringTable) -> bytes:
+    location = restaurant.get("location")
+    row: Dict[str, Any] = {}
+    extra: Dict[str, Any] = {}
+    for key, value in restaurant.items():
+        # Location fields fill the location columns; an empty or non-mapping
+        # location is kept as-is in the extras
+        if key == "location" and isinstance(location, Mapping) and location:
+            for location_key, location_value in location.items():
+                _place(location_key, location_value, _LOCATION_COLUMNS, f"location.{location_key}", row, extra)
+        else:
+            _place(key, value, _RESTAURANT_COLUMNS, key, row, extra)
+    present = nulls = 0
+    for name, value in row.items():
+        present |= _BITS[name]
+        if value is None:
+            nulls |= _BITS[name]
+    numbers = [_NONE if row.get(name) is None else strings.add(row[name]) for name in _STRING_COLUMNS]
+    floats = [row.get(name) or 0.0 for name in _FLOAT_COLUMNS]
+    extra_number = strings.add(json.dumps(extra, ensure_ascii=False)) if extra else _NONE
+    return _RECORD.pack(present, nulls, *numbers, *floats, bool(row.get("is_open")), extra_number)
+
+
+def write_snapshot(path: str, restaurants: List[Mapping], menus: Mapping):
+    """
+    Write restaurants (in catalog order) and menus (in their mapping order) to
+    `path`. Every value round-trips exactly, including key order for the
+    catalog's usual fields. Each menu item is also stored on its own, with the
+    columns MenuItemStore indexes. The file is replaced atomically, so workers
+    never map a half-written snapshot.
+    """
+    strings = _StringTable()
+    records = [_pack_restaurant(restaurant, strings) for restaurant in restaurants]
+    restaurant_order = sorted(range(len(restaurants)), key=lambda ordinal: restaurants[ordinal]["id"])
+
+    menu_ids = list(menus)
+    menu_entries = []
+    menu_data = bytearray()
+    item_rows = []
+    item_data = bytearray()
+    for restaurant_id in menu_ids:
+        menu = menus[restaurant_id]
+        encoded = json.dumps(menu, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        first_item = len(item_rows)
+        for category in menu.get("categories", []):
+            category_number = strings.add(category.get("name", ""))
+            for item in category.get("items", []):
+                encoded_item = json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                flags = (_SPICY if item.get("spicy", False) else 0) | (_VEGETARIAN if item.get("vegetarian", False) else 0)
+                item_rows.append(_ITEM.pack(strings.add(item.get("name", "")), category_number, len(encoded_item),
+                                            flags, float(item.get("price", 0) or 0), len(item_data)))
+                item_data += encoded_item
+        menu_entries.append(_MENU_ENTRY.pack(strings.add(restaurant_id), len(encoded), len(menu_data),
+                                             first_item, len(item_rows) - first_item))
+        menu_data += encoded
+    menu_order = sorted(range(len(menu_ids)), key=lambda position: menu_ids[position])
+
+    string_index = bytearray()
+    string_data = bytearray()
+    for encoded in strings.strings:
+        string_index += _STRING_ENTRY.pack(len(string_data), len(encoded))
+        string_data += encoded
+
+    sections = [
+        bytes(string_index),
+        bytes(string_data),
+        b"".join(records),
+        b"".join(_ORDINAL.pack(ordinal) for ordinal in restaurant_order),
+        b"".join(menu_entries),
+        b"".join(_ORDINAL.pack(position) for position in menu_order),
+        bytes(menu_data),
+        b"".join(item_rows),
+        bytes(item_data),
+    ]
+    offsets = []
+    offset = _HEADER.size
+    for section in sections:
+        offset = _align(offset)
+        offsets.append(offset)
+        offset += len(section)
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(records), len(strings.strings), len(menu_ids),
+                             len(item_rows), *offsets))
+        for section_offset, section in zip(offsets, sections):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(section)
+    os.replace(temporary, path)
+
+
+def _align(offset: int, boundary: int = 8) -> int:
+    return -(-offset // boundary) * boundary
+
+
+class CatalogSnapshot:
+    """
+    Read-only view of a snapshot file through a shared mmap.
+
+    Nothing is decoded up front or kept decoded: restaurants are
+    SnapshotRestaurant views that read each field from the mapped bytes when
+    it is accessed, and menus and menu items are decoded per request, so every
+    worker mapping the same file shares one copy of the catalog in the page
+    cache. Lookups mirror CatalogIndex (get, ordinal, record, len, in).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise SnapshotError(f"{path} is too short to be a catalog snapshot")
+        header = _HEADER.unpack_from(self._map, 0)
+        if header[0] != MAGIC or header[1] != FORMAT_VERSION:
+            raise SnapshotError(f"{path} is not a version {FORMAT_VERSION} catalog snapshot")
+        (self._count, self._string_count, self._menu_count, self._item_count, self._string_index,
+         self._string_data, self._records, self._id_index, self._menu_directory, self._menu_index,
+         self._menu_data, self._item_rows, self._item_data) = header[2:]
+        self.menus = SnapshotMenus(self)
+
+    def close(self):
+        self._map.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, restaurant_id: str):
+        return self.ordinal(restaurant_id) is not None
+
+    def _string(self, number: int) -> Optional[str]:
+        if number == _NONE:
+            return None
+        offset, length = _STRING_ENTRY.unpack_from(self._map, self._string_index + number * _STRING_ENTRY.size)
+        start = self._string_data + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def _search(self, index: int, count: int, key, target: str) -> Optional[int]:
+        # Binary search over an index of positions sorted by key(position)
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            position = _ORDINAL.unpack_from(self._map, index + middle * _ORDINAL.size)[0]
+            candidate = key(position)
+            if candidate == target:
+                return position
+            if candidate < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _row(self, ordinal: int) -> Tuple:
+        if not 0 <= ordinal < self._count:
+            raise IndexError(ordinal)
+        return _RECORD.unpack_from(self._map, self._records + ordinal * _RECORD.size)
+
+    def _restaurant_id(self, ordinal: int) -> Optional[str]:
+        row = self._row(ordinal)
+        if row[0] & _BITS["id"]:
+            return self._string(row[2])
+        return json.loads(self._string(row[-1]))["id"]
+
+    def ordinal(self, restaurant_id: str) -> Optional[int]:
+        """Catalog position of a restaurant"""
+        return self._search(self._id_index, self._count, self._restaurant_id, restaurant_id)
+
+    def record(self, ordinal: int) -> "SnapshotRestaurant":
+        """The restaurant at a catalog position, read in place"""
+        self._row(ordinal)
+        return SnapshotRestaurant(self, ordinal)
+
+    def get(self, restaurant_id: str) -> Optional["SnapshotRestaurant"]:
+        """A restaurant by ID, read in place, or None"""
+        ordinal = self.ordinal(restaurant_id)
+        return None if ordinal is None else SnapshotRestaurant(self, ordinal)
+
+    def restaurants(self) -> Iterator["SnapshotRestaurant"]:
+        """Every restaurant, in catalog order, read in place"""
+        for ordinal in range(self._count):
+            yield SnapshotRestaurant(self, ordinal)
+
+    def _extra(self, row: Tuple) -> Dict[str, Any]:
+        return json.loads(self._string(row[-1])) if row[-1] != _NONE else {}
+
+    def _field(self, ordinal: int, name: str, location: bool = False) -> Any:
+        # One restaurant field (or location field) as stored, or _ABSENT
+        row = self._row(ordinal)
+        if name in (_LOCATION_COLUMNS if location else _RESTAURANT_COLUMNS):
+            bit = _BITS[name]
+            if row[0] & bit:
+                if row[1] & bit:
+                    return None
+                value = row[_COLUMN_AT[name]]
+                return self._string(value) if name in _STRINGS else value
+        if row[-1] == _NONE:
+            return _ABSENT
+        return self._extra(row).get(f"location.{name}" if location else name, _ABSENT)
+
+    def _keys(self, ordinal: int, location: bool = False) -> List[str]:
+        # A restaurant's (or its location's) keys in the order they were written
+        row = self._row(ordinal)
+        present = row[0]
+        extra = self._extra(row)
+        if location:
+            if "location" in extra:
+                return []
+            keys = [name for name in LOCATION_FIELDS if present & _BITS[name] or f"location.{name}" in extra]
+            keys += [key[len("location."):] for key in extra
+                     if key.startswith("location.") and key[len("location."):] not in _LOCATION_COLUMNS]
+            return keys
+        keys = []
+        for name in FIELDS:
+            if name == "location":
+                if ("location" in extra or present & _LOCATION_BITS
+                        or any(key.startswith("location.") for key in extra)):
+                    keys.append(name)
+            elif present & _BITS[name] or name in extra:
+                keys.append(name)
+        keys += [key for key in extra if key not in _FIELD_SET and not key.startswith("location.")]
+        return keys
+
+    def _menu_entry(self, position: int) -> Tuple[int, int, int]:
+        return _MENU_ENTRY.unpack_from(self._map, self._menu_directory + position * _MENU_ENTRY.size)
+
+    def menu_ids(self) -> Iterator[str]:
+        """Restaurant ids that have a stored menu, in the order they were written"""
+        for position in range(self._menu_count):
+            yield self._string(self._menu_entry(position)[0])
+
+    def _menu_position(self, restaurant_id: str) -> Optional[int]:
+        return self._search(self._menu_index, self._menu_count,
+                            lambda p: self._string(self._menu_entry(p)[0]), restaurant_id)
+
+    def menu_bytes(self, restaurant_id: str) -> Optional[bytes]:
+        """A restaurant's menu as stored (compact UTF-8 JSON), or None"""
+        position = self._menu_position(restaurant_id)
+        if position is None:
+            return None
+        _, length, offset, _, _ = self._menu_entry(position)
+        start = self._menu_data + offset
+        return self._map[start:start + length]
+
+    def menu_items(self, restaurant_id: str) -> Optional[List[Tuple[str, str, float, bool, bool, int]]]:
+        """
+        A restaurant's menu items in menu order, as (name, category, price,
+        spicy, vegetarian, item number) rows read from the item columns, or
+        None when it has no menu. menu_item() decodes an item by its number.
+        """
+        position = self._menu_position(restaurant_id)
+        if position is None:
+            return None
+        _, _, _, first, count = self._menu_entry(position)
+        rows = []
+        for number in range(first, first + count):
+            name, category, _, flags, price, _ = _ITEM.unpack_from(self._map, self._item_rows + number * _ITEM.size)
+            rows.append((self._string(name), self._string(category), price,
+                         bool(flags & _SPICY), bool(flags & _VEGETARIAN), number))
+        return rows
+
+    def menu_item(self, number: int) -> Dict:
+        """A fresh menu item dict by item number"""
+        if not 0 <= number < self._item_count:
+            raise IndexError(number)
+        _, _, length, _, _, offset = _ITEM.unpack_from(self._map, self._item_rows + number * _ITEM.size)
+        start = self._item_data + offset
+        return json.loads(self._map[start:start + length])
+
+
+class SnapshotRestaurant(MutableMapping):
+    """
+    A restaurant (or, with location=True, its "location" sub-dict) read in
+    place from a snapshot: each access decodes only the field asked for, so
+    holding one costs a few pointers instead of a copy of the record.
+
+    It reads like the dict it was written from (same keys, order and values),
+    so catalog indexes and response models accept it unchanged. Writes are
+    kept on the object and take precedence over the file, like SnapshotMenus.
+    """
+
+    __slots__ = ("_snapshot", "_ordinal", "_is_location", "_changes", "_location")
+
+    def __init__(self, snapshot: CatalogSnapshot, ordinal: int, location: bool = False):
+        self._snapshot = snapshot
+        self._ordinal = ordinal
+        self._is_location = location
+        # Written keys (value, or _DELETED), and the location view once handed out
+        self._changes: Optional[Dict[str, Any]] = None
+        self._location: Optional[SnapshotRestaurant] = None
+
+    def _stored(self, key: str) -> Any:
+        if key == "location" and not self._is_location:
+            if self._location is not None:
+                return self._location
+            value = self._snapshot._field(self._ordinal, key)
+            if value is _ABSENT and self._snapshot._keys(self._ordinal, location=True):
+                # Kept, so writes into the location stick to this record
+                value = self._location = SnapshotRestaurant(self._snapshot, self._ordinal, location=True)
+            return value
+        return self._snapshot._field(self._ordinal, key, self._is_location)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Overrides Mapping.get, which goes through __getitem__ and a try/except
+        if self._changes is not None and key in self._changes:
+            value = self._changes[key]
+        else:
+            value = self._stored(key)
+        return default if value is _ABSENT or value is _DELETED else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        if self._changes is None:
+            self._changes = {}
+        self._changes[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        self[key] = _DELETED
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, _ABSENT) is not _ABSENT
+
+    def __iter__(self) -> Iterator[str]:
+        changes = self._changes or {}
+        stored = self._snapshot._keys(self._ordinal, self._is_location)
+        for key in stored:
+            if changes.get(key) is not _DELETED:
+                yield key
+        for key, value in changes.items():
+            if value is not _DELETED and key not in stored:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def copy(self) -> Dict[str, Any]:
+        """Shallow copy as a plain dict, like dict.copy()"""
+        return dict(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Deep copy as plain dicts (for JSON encoders that only accept dicts)"""
+        return {key: value.to_dict() if isinstance(value, SnapshotRestaurant) else value
+                for key, value in self.items()}
+
+
+class SnapshotMenus(MutableMapping):
+    """
+    MENUS-compatible mapping over a snapshot: menus are decoded from the
+    mapped file on access. Writes (add/replace/remove a menu) are kept in
+    this process only and take precedence over the file.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self._snapshot = snapshot
+        self._overrides: Dict[str, Dict] = {}
+        self._removed = set()
+
+    def __getitem__(self, restaurant_id: str) -> Dict:
+        menu = self._overrides.get(restaurant_id)
+        if menu is not None:
+            return menu
+        if restaurant_id not in self._removed:
+            encoded = self._snapshot.menu_bytes(restaurant_id)
+            if encoded is not None:
+                return json.loads(encoded)
+        raise KeyError(restaurant_id)
+
+    def __setitem__(self, restaurant_id: str, menu: Dict):
+        self._overrides[restaurant_id] = menu
+        self._removed.discard(restaurant_id)
+
+    def __delitem__(self, restaurant_id: str):
+        if restaurant_id not in self:
+            raise KeyError(restaurant_id)
+        self._overrides.pop(restaurant_id, None)
+        self._removed.add(restaurant_id)
+
+    def __contains__(self, restaurant_id: object) -> bool:
+        if restaurant_id in self._overrides:
+            return True
+        return restaurant_id not in self._removed and self._snapshot.menu_bytes(restaurant_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        stored = set()
+        for restaurant_id in self._snapshot.menu_ids():
+            if restaurant_id not in self._removed:
+                stored.add(restaurant_id)
+                yield restaurant_id
+        yield from [restaurant_id for restaurant_id in self._overrides if restaurant_id not in stored]
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def item_rows(self, restaurant_id: str) -> Optional[List[Tuple[str, str, float, bool, bool, int]]]:
+        """The mapped item columns of a menu still served from the file (see CatalogSnapshot.menu_items), else None"""
+        if restaurant_id in self._overrides or restaurant_id in self._removed:
+            return None
+        return self._snapshot.menu_items(restaurant_id)
+
+    def load_item(self, number: int) -> Dict:
+        """A menu item by the number item_rows() gave it"""
+        return self._snapshot.menu_item(number)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python catalog_snapshot.py OUTPUT_PATH")
+    from catalog_data import MENUS, RESTAURANTS
+    write_snapshot(sys.argv[1], RESTAURANTS, MENUS)
+    print(f"Wrote {len(RESTAURANTS)} restaurants and {len(MENUS)} menus to {sys.argv[1]}")
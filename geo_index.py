@@ -0,0 +1,119 @@
+"""
+Geospatial index for restaurant search
+KD-tree over points on the unit sphere with haversine distances
+"""
+
+import heapq
+from math import asin, cos, radians, sin, sqrt
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in kilometers between two lat/lng points"""
+    dlat = radians(lat2 - lat1)
+    dlng = radians(lng2 - lng1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def _to_unit_vector(lat: float, lng: float) -> Tuple[float, float, float]:
+    phi, lam = radians(lat), radians(lng)
+    return (cos(phi) * cos(lam), cos(phi) * sin(lam), sin(phi))
+
+
+def _chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, chord / 2))
+
+
+def _km_to_chord(km: float) -> float:
+    return 2 * sin(min(km / (2 * EARTH_RADIUS_KM), 3.141592653589793 / 2))
+
+
+class GeoIndex:
+    """
+    Static KD-tree for radius and k-nearest queries.
+
+    Points are stored as 3D unit vectors. Straight-line (chord) distance between
+    unit vectors grows monotonically with great-circle distance, so the tree can
+    prune with cheap Euclidean bounds and still rank results exactly by
+    haversine distance. The tree is immutable; rebuild it when the catalog
+    changes.
+    """
+
+    def __init__(self, points: Iterable[Tuple[Hashable, float, float]]):
+        self._keys: List[Hashable] = []
+        self._vectors: List[Tuple[float, float, float]] = []
+        for key, lat, lng in points:
+            if lat is None or lng is None:
+                continue
+            self._keys.append(key)
+            self._vectors.append(_to_unit_vector(lat, lng))
+        # Implicit tree: the median of each [lo, hi) slice is the node, split on depth % 3
+        self._order = list(range(len(self._keys)))
+        self._build(0, len(self._order), 0)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _build(self, lo: int, hi: int, depth: int):
+        if hi - lo <= 1:
+            return
+        axis = depth % 3
+        vectors = self._vectors
+        self._order[lo:hi] = sorted(self._order[lo:hi], key=lambda i: vectors[i][axis])
+        mid = (lo + hi) // 2
+        self._build(lo, mid, depth + 1)
+        self._build(mid + 1, hi, depth + 1)
+
+    def nearest(self, lat: float, lng: float, k: Optional[int] = None, radius_km: Optional[float] = None,
+                accept: Optional[Callable[[Hashable], bool]] = None) -> List[Tuple[float, Hashable]]:
+        """
+        Points closest to (lat, lng) as (distance_km, key) pairs, nearest first.
+
+        - **k**: return at most k points (None for no limit)
+        - **radius_km**: only points within this distance (None for no limit)
+        - **accept**: optional predicate on the key; rejected points are skipped
+          without using up any of the k slots
+        """
+        if k is not None and k <= 0:
+            return []
+        target = _to_unit_vector(lat, lng)
+        max_sq = _km_to_chord(radius_km) ** 2 if radius_km is not None else float("inf")
+        # Max-heap of (-chord_sq, -index) holding the best candidates so far
+        best: List[Tuple[float, int]] = []
+        keys, vectors, order = self._keys, self._vectors, self._order
+
+        def bound() -> float:
+            if k is not None and len(best) == k:
+                return min(max_sq, -best[0][0])
+            return max_sq
+
+        def visit(lo: int, hi: int, depth: int):
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            index = order[mid]
+            point = vectors[index]
+            dx = target[0] - point[0]
+            dy = target[1] - point[1]
+            dz = target[2] - point[2]
+            dist_sq = dx * dx + dy * dy + dz * dz
+            if dist_sq <= bound() and (accept is None or accept(keys[index])):
+                entry = (-dist_sq, -index)
+                if k is not None and len(best) == k:
+                    heapq.heappushpop(best, entry)
+                else:
+                    heapq.heappush(best, entry)
+            axis = depth % 3
+            diff = target[axis] - point[axis]
+            near, far = ((lo, mid), (mid + 1, hi)) if diff <= 0 else ((mid + 1, hi), (lo, mid))
+            visit(near[0], near[1], depth + 1)
+            if diff * diff <= bound():
+                visit(far[0], far[1], depth + 1)
+
+        visit(0, len(order), 0)
+        # Ties on distance fall back to insertion order of the points
+        ranked = sorted((-neg_sq, -neg_index) for neg_sq, neg_index in best)
+        return [(_chord_to_km(sqrt(dist_sq)), keys[index]) for dist_sq, index in ranked]
@@ -3,14 +3,17 @@ AI Food Ordering Mock API
 FastAPI backend simulating restaurant ordering platform
 """
 
-from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
-import json
-from starlette.middleware.base import BaseHTTPMiddleware
+import os
+import time
 
 from mock_data import (
     get_restaurants_by_location,
@@ -18,32 +21,61 @@ from mock_data import (
     get_menu_by_restaurant_id,
     create_order,
     get_order_by_id,
+    get_orders_by_ids,
+    query_orders,
+    get_order_status_counts,
     update_order_status,
     process_payment,
     CUISINES,
     CITIES,
     RESTAURANTS,
-    MENUS,
     get_favorite_restaurants,
     add_favorite_restaurant,
     remove_favorite_restaurant,
     get_favorite_items,
     add_favorite_item,
-    remove_favorite_item
+    remove_favorite_item,
+    get_catalog_version,
+    load_catalog,
+    CATALOG_INDEX,
+    CATALOG_LAZY,
+    MENU_ITEM_STORE,
+    ORDER_REPOSITORY,
+    ORDER_STORAGE,
+    ORDER_WRITE_BEHIND,
+    wait_for_order_capacity
 )
+from catalog_index import parse_delivery_time
+from order_events import TIMEOUT, OrderEventHub
+from order_retention import OrderRetentionSweeper
+from order_scheduler import OrderStatusScheduler
+from order_timeline import next_stage_at, project, status_changes
+from query_parser import QueryParser
+from search_cache import MISSING, SearchCache
+from request_logging import AccessLog, configure_logging, stop_logging
+from response_cache import (
+    FastJSONResponse,
+    JSONFileCache,
+    VersionedResponseCache,
+    conditional_response,
+    encode_json,
+    fast_encode_json,
+)
+from timer_wheel import TimerWheel
 
 # Configure logging
-# Note: File logging disabled for Vercel serverless environment (read-only filesystem)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()  # Console only for Vercel
-    ]
-)
+# Note: File logging disabled for Vercel serverless environment (read-only filesystem).
+# Records are written as single-line JSON by a background thread, not on the event loop.
+configure_logging()
 logger = logging.getLogger(__name__)
+access_log = AccessLog(logging.getLogger("access"))
+
+# FAST_JSON=1: encode every response with orjson (when installed), and send trusted catalog
+# records without re-validating them against their response model (see trusted_response)
+FAST_JSON = os.getenv("FAST_JSON", "0") == "1"
 
 app = FastAPI(
+    default_response_class=FastJSONResponse if FAST_JSON else JSONResponse,
     title="AI Food Ordering API",
     description="Mock API for ChatGPT Custom GPT integration - Restaurant ordering platform",
     version="1.0.0",
@@ -62,42 +94,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def start_order_write_behind():
+    """Start batching order writes on the server's event loop"""
+    if ORDER_WRITE_BEHIND is not None:
+        ORDER_WRITE_BEHIND.start()
+
+
+@app.on_event("startup")
+async def start_order_scheduler():
+    """Schedule status transitions for every undelivered order"""
+    ORDER_SCHEDULER.start()
+
+
+@app.on_event("startup")
+async def start_order_retention():
+    """Compact delivered orders past their retention TTL in the background"""
+    ORDER_RETENTION.start()
+
+
+@app.on_event("shutdown")
+async def close_order_storage():
+    """Finish pending order writes and close storage connections"""
+    ORDER_SCHEDULER.stop()
+    await ORDER_RETENTION.stop()
+    if ORDER_WRITE_BEHIND is not None:
+        await ORDER_WRITE_BEHIND.stop()
+    ORDER_REPOSITORY.close()
+
+
+@app.on_event("shutdown")
+async def flush_logs():
+    """Drain queued log records before the process exits"""
+    stop_logging()
+
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all API requests and responses"""
-    request_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-    
-    # Log request
-    request_log = {
-        "request_id": request_id,
-        "timestamp": datetime.now().isoformat(),
-        "method": request.method,
-        "url": str(request.url),
-        "path": request.url.path,
-        "query_params": dict(request.query_params),
-        "client_host": request.client.host if request.client else None,
-        "user_agent": request.headers.get("user-agent", ""),
-    }
+    """Log one compact access record per (sampled) request"""
+    request_id = access_log.next_request_id()
+    started = time.perf_counter()
     
     # NOTE: Do NOT read request body here - it will consume the stream
     # and prevent FastAPI from reading it in the endpoint handler
     # Body logging is done inside individual endpoints instead
     
-    logger.info(f"REQUEST: {json.dumps(request_log, indent=2)}")
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Log response
-    response_log = {
-        "request_id": request_id,
-        "timestamp": datetime.now().isoformat(),
-        "status_code": response.status_code,
-    }
-    
-    logger.info(f"RESPONSE: {json.dumps(response_log, indent=2)}")
+    client_host = request.client.host if request.client else None
+    try:
+        response = await call_next(request)
+    except Exception:
+        access_log.log(request_id, request.method, request.url.path, 500, started, client_host)
+        raise
     
+    access_log.log(request_id, request.method, request.url.path, response.status_code, started, client_host)
+    response.headers["X-Request-ID"] = request_id
     return response
 
 # Pydantic models
@@ -122,6 +173,9 @@ class Restaurant(BaseModel):
     is_open: bool
     image_url: Optional[str] = None
 
+class RestaurantSearchResult(Restaurant):
+    distance: Optional[float] = Field(None, description="Distance in km from the search coordinates (lat/lng searches only)")
+
 class MenuItem(BaseModel):
     id: str
     name: str
@@ -168,6 +222,28 @@ class Order(BaseModel):
     estimated_delivery: str
     payment_status: str
 
+class OrderSummary(BaseModel):
+    """Compact order projection for dashboards"""
+    id: str
+    restaurant_id: str
+    restaurant_name: Optional[str] = None
+    status: str
+    payment_status: Optional[str] = None
+    total: float
+    items_count: int
+    created_at: str
+
+class OrderBatchRequest(BaseModel):
+    order_ids: List[str] = Field(..., max_length=500, description="Order IDs to look up (at most 500)")
+
+class OrderBatchResponse(BaseModel):
+    orders: List[OrderSummary]
+    missing: List[str]
+
+class OrderListResponse(BaseModel):
+    orders: List[OrderSummary]
+    count: int
+
 class PaymentMethod(BaseModel):
     type: str = Field(..., description="Payment type: credit_card, debit_card, paypal, apple_pay")
     last_four: Optional[str] = Field(None, description="Last 4 digits of card")
@@ -221,53 +297,84 @@ async def root():
         }
     }
 
+# Production OpenAPI spec, read once and re-read only when the file changes
+PRODUCTION_OPENAPI = JSONFileCache(os.path.join(os.path.dirname(__file__), "openapi-production.json"))
+PRODUCTION_OPENAPI_CACHE_CONTROL = "public, max-age=300"
+
 @app.get("/openapi-production.json")
-async def get_production_openapi():
+async def get_production_openapi(request: Request):
     """Serve production-only OpenAPI spec (no localhost)"""
-    import os
-    import json
-    
-    # Read the openapi-production.json file
-    file_path = os.path.join(os.path.dirname(__file__), "openapi-production.json")
-    with open(file_path, 'r') as f:
-        return json.load(f)
+    return conditional_response(request, PRODUCTION_OPENAPI.get(), PRODUCTION_OPENAPI_CACHE_CONTROL)
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (degraded while buffered order writes keep failing to reach storage)"""
+    healthy = ORDER_WRITE_BEHIND is None or ORDER_WRITE_BEHIND.healthy
     return {
-        "status": "healthy",
+        "status": "healthy" if healthy else "degraded",
         "timestamp": datetime.now().isoformat()
     }
 
 # Restaurant Endpoints
 
+def trusted_response(content):
+    """
+    With FAST_JSON, send content we generated ourselves as-is, skipping response_model
+    validation; otherwise return it for FastAPI to validate. Only for data already in
+    the model's exact shape (catalog restaurant records, not orders or menus, whose
+    models fill defaults and drop internal fields).
+    """
+    return FastJSONResponse(content) if FAST_JSON else content
+
 @app.get(
     "/api/v1/restaurants/search",
-    response_model=List[Restaurant],
+    response_model=List[RestaurantSearchResult],
+    response_model_exclude_unset=True,
     summary="Search restaurants",
-    description="Search for restaurants by location, cuisine, or coordinates. Returns list of available restaurants."
+    description="Search for restaurants by location, cuisine, price range, open status, or coordinates. Returns list of available restaurants."
 )
 async def search_restaurants(
     city: Optional[str] = None,
     cuisine: Optional[str] = None,
     lat: Optional[float] = None,
-    lng: Optional[float] = None
+    lng: Optional[float] = None,
+    price_range: Optional[str] = None,
+    is_open: Optional[bool] = None,
+    radius_km: Optional[float] = Query(None, gt=0),
+    limit: Optional[int] = Query(None, ge=1)
 ):
     """
     Search for restaurants based on various criteria.
     
     - **city**: Filter by city name (e.g., "San Francisco")
     - **cuisine**: Filter by cuisine type (e.g., "Indian", "Chinese", "Italian")
-    - **lat**: Latitude for location-based search
+    - **lat**: Latitude for location-based search (results sorted by distance, nearest first)
     - **lng**: Longitude for location-based search
+    - **price_range**: Filter by price range (e.g., "$", "$$", "$$$")
+    - **is_open**: Only open (true) or closed (false) restaurants
+    - **radius_km**: With lat/lng, only restaurants within this many kilometers
+    - **limit**: Maximum number of restaurants to return (with lat/lng: the k nearest)
     """
-    logger.info(f"Searching restaurants: city={city}, cuisine={cuisine}, lat={lat}, lng={lng}")
+    logger.debug("Searching restaurants: city=%s, cuisine=%s, lat=%s, lng=%s, price_range=%s, is_open=%s, "
+                 "radius_km=%s, limit=%s", city, cuisine, lat, lng, price_range, is_open, radius_km, limit)
     
-    restaurants = get_restaurants_by_location(city=city, cuisine=cuisine, lat=lat, lng=lng)
+    restaurants = get_restaurants_by_location(city=city, cuisine=cuisine, lat=lat, lng=lng,
+                                              price_range=price_range, is_open=is_open,
+                                              radius_km=radius_km, limit=limit)
     
-    logger.info(f"Found {len(restaurants)} restaurants")
-    return restaurants
+    logger.debug("Found %d restaurants", len(restaurants))
+    return trusted_response(restaurants)
+
+# Catalog responses, validated and encoded once per catalog version and served with ETags.
+# "no-cache" keeps clients revalidating, so a catalog change is visible on the next request.
+CATALOG_RESPONSES = VersionedResponseCache(get_catalog_version, encode=fast_encode_json if FAST_JSON else encode_json)
+CATALOG_CACHE_CONTROL = "no-cache"
+
+def model_payload(model, content):
+    """content exactly as a response_model=model endpoint would send it (None passes through)"""
+    if content is None:
+        return None
+    return model.model_validate(content).model_dump(mode="json")
 
 @app.get(
     "/api/v1/restaurants/{restaurant_id}",
@@ -275,19 +382,22 @@ async def search_restaurants(
     summary="Get restaurant details",
     description="Get detailed information about a specific restaurant"
 )
-async def get_restaurant(restaurant_id: str):
+async def get_restaurant(restaurant_id: str, request: Request):
     """
     Get detailed information about a specific restaurant.
     
     - **restaurant_id**: Unique restaurant identifier
     """
-    logger.info(f"Getting restaurant details: {restaurant_id}")
+    logger.debug("Getting restaurant details: %s", restaurant_id)
     
-    restaurant = get_restaurant_by_id(restaurant_id)
-    if not restaurant:
+    payload = CATALOG_RESPONSES.get(
+        ("restaurant", restaurant_id),
+        lambda: model_payload(Restaurant, get_restaurant_by_id(restaurant_id) or None),
+    )
+    if payload is None:
         raise HTTPException(status_code=404, detail="Restaurant not found")
     
-    return restaurant
+    return conditional_response(request, payload, CATALOG_CACHE_CONTROL)
 
 @app.get(
     "/api/v1/restaurants/{restaurant_id}/menu",
@@ -295,24 +405,70 @@ async def get_restaurant(restaurant_id: str):
     summary="Get restaurant menu",
     description="Get the complete menu for a specific restaurant with all items and prices"
 )
-async def get_menu(restaurant_id: str):
+async def get_menu(restaurant_id: str, request: Request):
     """
     Get the complete menu for a restaurant.
     
     - **restaurant_id**: Unique restaurant identifier
     """
-    logger.info(f"Getting menu for restaurant: {restaurant_id}")
+    logger.debug("Getting menu for restaurant: %s", restaurant_id)
+    
+    def build():
+        # Verify restaurant exists
+        if not get_restaurant_by_id(restaurant_id):
+            return None
+        return model_payload(Menu, get_menu_by_restaurant_id(restaurant_id))
+    
+    payload = CATALOG_RESPONSES.get(("menu", restaurant_id), build)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    
+    return conditional_response(request, payload, CATALOG_CACHE_CONTROL)
+
+@app.get(
+    "/api/v1/restaurants/{restaurant_id}/orders",
+    response_model=OrderListResponse,
+    summary="Get restaurant orders",
+    description="Orders placed with a restaurant, optionally by status and creation time (for restaurant tablets)"
+)
+async def get_restaurant_orders(
+    restaurant_id: str,
+    status: Optional[str] = Query(None, description="Only orders with this status"),
+    since: Optional[str] = Query(None, description="Only orders created at or after this ISO timestamp"),
+    until: Optional[str] = Query(None, description="Only orders created before this ISO timestamp"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of orders to return")
+):
+    """
+    Get a restaurant's orders, oldest first.
+    
+    - **restaurant_id**: Unique restaurant identifier
+    - **status**: e.g. pending, preparing, ready_for_pickup
+    - **since** / **until**: ISO 8601 timestamps (until is exclusive)
+    - **limit**: Maximum number of orders (1-1000)
+    """
+    logger.debug("Getting orders for restaurant: %s, status=%s", restaurant_id, status)
     
     # Verify restaurant exists
     restaurant = get_restaurant_by_id(restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
     
-    menu = get_menu_by_restaurant_id(restaurant_id)
-    return menu
+    orders = await order_io(query_orders, status=status, restaurant_id=restaurant_id,
+                            since=order_timestamp(since, "since"), until=order_timestamp(until, "until"), limit=limit)
+    return {"orders": [order_summary(order) for order in orders], "count": len(orders)}
 
 # Order Endpoints
 
+async def order_io(func, *args, **kwargs):
+    """
+    Call an order storage function without stalling the event loop: durable
+    backends (SQLite) block on disk and on their writer thread, so their calls
+    run in the threadpool; in-memory calls are cheap and run inline.
+    """
+    if ORDER_STORAGE.durable:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
 @app.options("/api/v1/orders/create")
 async def create_order_options():
     """Handle OPTIONS preflight for create order"""
@@ -334,30 +490,119 @@ async def create_new_order(order_request: CreateOrderRequest):
     - **special_instructions**: Optional special requests
     """
     try:
-        logger.info(f"[CREATE_ORDER] START: restaurant={order_request.restaurant_id}, items={len(order_request.items)}")
+        logger.debug("[CREATE_ORDER] START: restaurant=%s, items=%d", order_request.restaurant_id, len(order_request.items))
         
         # Verify restaurant exists
         restaurant = get_restaurant_by_id(order_request.restaurant_id)
         if not restaurant:
-            logger.error(f"[CREATE_ORDER] Restaurant not found: {order_request.restaurant_id}")
+            logger.error("[CREATE_ORDER] Restaurant not found: %s", order_request.restaurant_id)
             raise HTTPException(status_code=404, detail="Restaurant not found")
         
-        logger.info(f"[CREATE_ORDER] Restaurant found: {restaurant['name']}")
+        logger.debug("[CREATE_ORDER] Restaurant found: %s", restaurant["name"])
         
         # Create order
         order_data = order_request.dict()
-        logger.info(f"[CREATE_ORDER] Creating order with data: {json.dumps(order_data, indent=2)}")
+        logger.debug("[CREATE_ORDER] Creating order with data: %s", order_data)
         
-        order = create_order(order_data)
+        await wait_for_order_capacity()
+        order = await order_io(create_order, order_data)
         
-        logger.info(f"[CREATE_ORDER] SUCCESS: {order['id']}, total=${order['total']}")
+        logger.info("[CREATE_ORDER] SUCCESS: %s, total=$%s", order["id"], order["total"])
         return order
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"[CREATE_ORDER] ERROR: {str(e)}", exc_info=True)
+        logger.error("[CREATE_ORDER] ERROR: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create order: {str(e)}")
 
+def order_summary(order: Dict) -> Dict:
+    """Compact projection of an order"""
+    return {
+        "id": order["id"],
+        "restaurant_id": order.get("restaurant_id"),
+        "restaurant_name": order.get("restaurant_name"),
+        "status": order.get("status"),
+        "payment_status": order.get("payment_status"),
+        "total": order.get("total", 0),
+        "items_count": len(order.get("items", [])),
+        "created_at": order.get("created_at")
+    }
+
+def order_timestamp(value: Optional[str], name: str) -> Optional[str]:
+    """Normalize an ISO timestamp query parameter to the naive local form orders are stored with"""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO 8601 timestamp")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.isoformat()
+
+@app.post(
+    "/api/v1/orders/batch",
+    response_model=OrderBatchResponse,
+    summary="Get many orders",
+    description="Get compact status projections for up to 500 orders in one request"
+)
+async def get_orders_batch(batch_request: OrderBatchRequest):
+    """
+    Get compact projections of many orders at once.
+    
+    - **order_ids**: Order IDs to look up; unknown IDs are listed in `missing`
+    """
+    logger.debug("Getting %d orders in batch", len(batch_request.order_ids))
+    
+    order_ids = list(dict.fromkeys(batch_request.order_ids))
+    orders = await order_io(get_orders_by_ids, order_ids)
+    return {
+        "orders": [order_summary(orders[order_id]) for order_id in order_ids if order_id in orders],
+        "missing": [order_id for order_id in order_ids if order_id not in orders]
+    }
+
+@app.get(
+    "/api/v1/orders",
+    response_model=OrderListResponse,
+    summary="List orders",
+    description="List orders by status, restaurant and creation time as compact projections"
+)
+async def list_orders(
+    status: Optional[str] = Query(None, description="Only orders with this status"),
+    restaurant_id: Optional[str] = Query(None, description="Only orders from this restaurant"),
+    since: Optional[str] = Query(None, description="Only orders created at or after this ISO timestamp"),
+    until: Optional[str] = Query(None, description="Only orders created before this ISO timestamp"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of orders to return")
+):
+    """
+    List orders, oldest first.
+    
+    - **status**: e.g. pending, preparing, out_for_delivery
+    - **restaurant_id**: Restaurant identifier
+    - **since** / **until**: ISO 8601 timestamps, e.g. 2025-01-01T12:00:00 (until is exclusive)
+    - **limit**: Maximum number of orders (1-1000)
+    """
+    logger.debug("Listing orders: status=%s, restaurant_id=%s, since=%s, until=%s, limit=%s",
+                 status, restaurant_id, since, until, limit)
+    
+    orders = await order_io(query_orders, status=status, restaurant_id=restaurant_id,
+                            since=order_timestamp(since, "since"), until=order_timestamp(until, "until"), limit=limit)
+    return {"orders": [order_summary(order) for order in orders], "count": len(orders)}
+
+@app.get(
+    "/api/v1/orders/stats",
+    summary="Order counts by status",
+    description="Number of orders currently in each status, plus order memory/retention metrics (for ops tooling)"
+)
+async def order_stats():
+    """
+    Count orders per status, straight from the order store's status index.
+    """
+    logger.debug("Getting order status counts")
+    
+    counts = await order_io(get_order_status_counts)
+    return {"by_status": counts, "total": sum(counts.values()), "storage": await order_io(ORDER_RETENTION.stats)}
+
 @app.get(
     "/api/v1/orders/{order_id}",
     response_model=Order,
@@ -370,9 +615,9 @@ async def get_order(order_id: str):
     
     - **order_id**: Unique order identifier
     """
-    logger.info(f"Getting order: {order_id}")
+    logger.debug("Getting order: %s", order_id)
     
-    order = get_order_by_id(order_id)
+    order = await order_io(get_order_by_id, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -391,25 +636,70 @@ async def process_order_payment(order_id: str, payment_request: PaymentRequest):
     - **order_id**: Unique order identifier
     - **payment_method**: Payment method details
     """
-    logger.info(f"Processing payment for order: {order_id}, method={payment_request.payment_method.type}")
+    logger.debug("Processing payment for order: %s, method=%s", order_id, payment_request.payment_method.type)
     
     # Verify order exists
-    order = get_order_by_id(order_id)
+    order = await order_io(get_order_by_id, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
     # Process payment
-    result = process_payment(order_id, payment_request.payment_method.dict())
+    await wait_for_order_capacity()
+    result = await order_io(process_payment, order_id, payment_request.payment_method.dict())
     
-    logger.info(f"Payment result: {result}")
+    logger.info("Payment result for %s: success=%s", order_id, result["success"])
     return result
 
+# One timer wheel for every order timer: status transitions, long-polls and streams
+ORDER_TIMERS = TimerWheel()
+
+# Advances every active order's status at its stage boundaries (started with the app)
+ORDER_SCHEDULER = OrderStatusScheduler(ORDER_REPOSITORY, ORDER_TIMERS, offload=ORDER_STORAGE.durable)
+ORDER_REPOSITORY.add_listener(ORDER_SCHEDULER.repository_listener)
+
+# Wakes long-poll and streaming trackers on order writes and stage boundaries
+ORDER_EVENTS = OrderEventHub(ORDER_TIMERS)
+ORDER_REPOSITORY.add_listener(ORDER_EVENTS.publish)
+
+# Archives (and optionally drops) delivered orders past their retention TTL (started with the app)
+ORDER_RETENTION = OrderRetentionSweeper(ORDER_REPOSITORY)
+
+# Seconds between SSE keep-alive comments on an otherwise idle stream
+TRACK_STREAM_KEEPALIVE = 15
+
+def build_tracking_response(order_id: str, order: Dict):
+    """Tracking payload for an order, plus its timeline state; writes only on a status transition"""
+    # Project the precomputed status timeline; storage is written only when a new status is reached.
+    # A stored status ahead of the timeline (set by hand) is reported as is, never moved back.
+    state = project(order)
+    changes = status_changes(order, state)
+    if changes:
+        ORDER_REPOSITORY.update(order_id, changes)
+    
+    payload = {
+        "order_id": order_id,
+        "status": state.status,
+        "status_message": state.message,
+        "estimated_delivery": state.estimated_delivery,
+        "minutes_remaining": state.eta_minutes,
+        "restaurant": order.get("restaurant_name", "Restaurant"),
+        "total": order.get("total", 0),
+        "items_count": len(order.get("items", [])),
+        "delivery_address": order.get("delivery_address", {}).get("address", ""),
+        "created_at": order.get("created_at"),
+        "elapsed_minutes": state.elapsed_minutes
+    }
+    return payload, state
+
 @app.get(
     "/api/v1/orders/{order_id}/track",
     summary="Track order",
     description="Get real-time order tracking information with automatic status progression"
 )
-async def track_order(order_id: str):
+async def track_order(
+    order_id: str,
+    wait: Optional[float] = Query(None, ge=0, le=60, description="Long-poll: hold the request up to this many seconds until the order changes or reaches its next stage")
+):
     """
     Track order with automatic status updates based on time elapsed.
     
@@ -422,68 +712,68 @@ async def track_order(order_id: str):
     - 20-30 mins: ready_for_pickup
     - 30-45 mins: out_for_delivery
     - 45+ mins: delivered
+    
+    With **wait**, the response is held until the order is updated, moves to
+    its next stage, or the wait runs out, then returns the current state.
     """
-    logger.info(f"Tracking order: {order_id}")
+    logger.debug("Tracking order: %s", order_id)
     
-    order = get_order_by_id(order_id)
+    order = await order_io(get_order_by_id, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
-    # Calculate time elapsed since order creation
-    from datetime import datetime, timedelta
-    created_at = datetime.fromisoformat(order.get("created_at", datetime.now().isoformat()))
-    elapsed_minutes = (datetime.now() - created_at).total_seconds() / 60
-    
-    # Auto-update status based on elapsed time (DEMO MODE: 12 mins total)
-    # 6 stages × 2 minutes each for quick demo
-    if elapsed_minutes < 2:
-        current_status = "pending"
-        status_message = "Order received! Waiting for restaurant confirmation."
-        eta_minutes = 12
-    elif elapsed_minutes < 4:
-        current_status = "confirmed"
-        status_message = "Restaurant confirmed your order!"
-        eta_minutes = 10
-    elif elapsed_minutes < 6:
-        current_status = "preparing"
-        status_message = "Your food is being prepared! 🍳"
-        eta_minutes = 8
-    elif elapsed_minutes < 8:
-        current_status = "ready_for_pickup"
-        status_message = "Order is ready! Waiting for delivery driver."
-        eta_minutes = 6
-    elif elapsed_minutes < 10:
-        current_status = "out_for_delivery"
-        status_message = "On the way to you! 🚚"
-        eta_minutes = 4
-    elif elapsed_minutes < 12:
-        current_status = "out_for_delivery"
-        status_message = "Almost there! Driver is nearby! 🚚"
-        eta_minutes = 2
-    else:
-        current_status = "delivered"
-        status_message = "Delivered! Enjoy your meal! 🍽️"
-        eta_minutes = 0
+    payload, state = await order_io(build_tracking_response, order_id, order)
+    next_at = next_stage_at(order, state)
+    if not wait or next_at is None:
+        return payload
     
-    # Update order status in storage
-    order["status"] = current_status
+    await ORDER_EVENTS.wait(order_id, next_at, wait)
+    # Re-read even on a stage boundary: the status may have been set meanwhile
+    order = await order_io(get_order_by_id, order_id) or order
+    payload, _ = await order_io(build_tracking_response, order_id, order)
+    return payload
+
+@app.get(
+    "/api/v1/orders/{order_id}/track/stream",
+    summary="Stream order tracking",
+    description="Server-Sent Events stream of tracking updates, pushed when the order changes or reaches its next stage"
+)
+async def stream_order_tracking(order_id: str):
+    """
+    Stream order tracking as Server-Sent Events.
     
-    # Calculate ETA
-    eta_time = (datetime.now() + timedelta(minutes=eta_minutes)).strftime("%I:%M %p")
+    - **order_id**: Unique order identifier
     
-    return {
-        "order_id": order_id,
-        "status": current_status,
-        "status_message": status_message,
-        "estimated_delivery": eta_time if eta_minutes > 0 else "Delivered",
-        "minutes_remaining": eta_minutes,
-        "restaurant": order.get("restaurant_name", "Restaurant"),
-        "total": order.get("total", 0),
-        "items_count": len(order.get("items", [])),
-        "delivery_address": order.get("delivery_address", {}).get("address", ""),
-        "created_at": order.get("created_at"),
-        "elapsed_minutes": int(elapsed_minutes)
-    }
+    Sends the current tracking state immediately, then a `status` event each
+    time the order moves to its next stage or is updated (payment, status
+    change). The stream ends after the delivered (or cancelled) event.
+    """
+    logger.debug("Streaming tracking for order: %s", order_id)
+    
+    order = await order_io(get_order_by_id, order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    async def events():
+        current = order
+        while True:
+            payload, state = await order_io(build_tracking_response, order_id, current)
+            yield b"event: status\ndata: " + encode_json(payload) + b"\n\n"
+            next_at = next_stage_at(current, state)
+            if next_at is None:
+                return
+            reason = await ORDER_EVENTS.wait(order_id, next_at, TRACK_STREAM_KEEPALIVE)
+            while reason == TIMEOUT:
+                yield b": keep-alive\n\n"
+                reason = await ORDER_EVENTS.wait(order_id, next_at, TRACK_STREAM_KEEPALIVE)
+            # Re-read even on a stage boundary: the status may have changed while no wait was open
+            current = await order_io(get_order_by_id, order_id) or current
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.patch(
     "/api/v1/orders/{order_id}/status",
@@ -498,9 +788,10 @@ async def update_order(order_id: str, status: str):
     - **order_id**: Unique order identifier
     - **status**: New status (pending, confirmed, preparing, ready_for_pickup, out_for_delivery, delivered)
     """
-    logger.info(f"Updating order status: {order_id} -> {status}")
+    logger.info("Updating order status: %s -> %s", order_id, status)
     
-    order = update_order_status(order_id, status)
+    await wait_for_order_capacity()
+    order = await order_io(update_order_status, order_id, status)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -513,32 +804,42 @@ async def update_order(order_id: str, status: str):
     summary="Get available cuisines",
     description="Get list of all available cuisine types in a structured format"
 )
-async def get_cuisines():
+async def get_cuisines(request: Request):
     """Get list of available cuisines"""
-    logger.info("Getting available cuisines")
-    cuisines = sorted(CUISINES)
-    return {
-        "cuisines": cuisines,
-        "count": len(cuisines),
-        "message": "Available cuisine types",
-        "prompt": "Which cuisine are you in the mood for? Choose one from the list above."
-    }
+    logger.debug("Getting available cuisines")
+    
+    def build():
+        load_catalog()
+        cuisines = sorted(CUISINES)
+        return {
+            "cuisines": cuisines,
+            "count": len(cuisines),
+            "message": "Available cuisine types",
+            "prompt": "Which cuisine are you in the mood for? Choose one from the list above."
+        }
+    
+    return conditional_response(request, CATALOG_RESPONSES.get(("cuisines",), build), CATALOG_CACHE_CONTROL)
 
 @app.get(
     "/api/v1/cities",
     summary="Get available cities",
     description="Get list of all cities with restaurants in a structured format for better UX"
 )
-async def get_cities():
+async def get_cities(request: Request):
     """Get list of cities with restaurants"""
-    logger.info("Getting available cities")
-    cities = sorted(CITIES)
-    return {
-        "cities": cities,
-        "count": len(cities),
-        "message": "Available cities for food delivery",
-        "prompt": "Which city are you in? Just type or click one of the options above."
-    }
+    logger.debug("Getting available cities")
+    
+    def build():
+        load_catalog()
+        cities = sorted(CITIES)
+        return {
+            "cities": cities,
+            "count": len(cities),
+            "message": "Available cities for food delivery",
+            "prompt": "Which city are you in? Just type or click one of the options above."
+        }
+    
+    return conditional_response(request, CATALOG_RESPONSES.get(("cities",), build), CATALOG_CACHE_CONTROL)
 
 # User preference endpoints (for future enhancement)
 
@@ -553,7 +854,7 @@ async def get_user_location(city: Optional[str] = None):
     In production, this would use IP geolocation or user profile.
     For demo, returns San Francisco by default or specified city.
     """
-    logger.info(f"Getting user location: {city if city else 'default'}")
+    logger.debug("Getting user location: %s", city or "default")
     
     # If city specified, try to find a restaurant in that city
     if city:
@@ -580,106 +881,33 @@ async def get_user_location(city: Optional[str] = None):
 
 # Intelligent Search Endpoint
 
+_query_parser: Optional[QueryParser] = None
+
+def get_query_parser() -> QueryParser:
+    """Compiled query parser for the current catalog (recompiled only when the catalog changes)"""
+    global _query_parser
+    version = get_catalog_version()
+    if _query_parser is None or _query_parser.version != version:
+        _query_parser = QueryParser(CUISINES, version=version)
+    return _query_parser
+
+if not CATALOG_LAZY:
+    get_query_parser()  # Compile at startup rather than on the first search
+
 def parse_natural_language_query(query: str, location: Optional[str] = None) -> ParsedQuery:
     """
     Parse natural language query into structured data
     """
-    query_lower = query.lower()
-    
-    # Extract cuisine
-    cuisines_found = []
-    for cuisine in CUISINES:
-        if cuisine.lower() in query_lower:
-            cuisines_found.append(cuisine)
-    
-    # Extract dish names (common dishes)
-    dish = None
-    common_dishes = [
-        # Indian dishes (match our menu)
-        "chicken tikka masala", "chicken tikka", "butter chicken", "tandoori chicken",
-        "paneer butter masala", "lamb rogan josh", "chicken biryani", "vegetable biryani",
-        "samosa", "biryani", "naan", "garlic naan", "butter naan",
-        # Italian
-        "pizza", "pasta", "margherita", "pepperoni", "lasagna", "carbonara",
-        # Japanese
-        "sushi", "ramen", "tempura", "teriyaki",
-        # Mexican
-        "tacos", "burrito", "quesadilla", "enchilada",
-        # Thai
-        "pad thai", "curry", "fried rice", "noodles", "tom yum"
-    ]
-    for dish_name in common_dishes:
-        if dish_name in query_lower:
-            dish = dish_name.title()
-            break
-    
-    # Extract price constraint
-    price_max = None
-    import re
-    price_match = re.search(r'\$(\d+)', query_lower)
-    if price_match:
-        price_max = float(price_match.group(1))
-    elif "under" in query_lower or "below" in query_lower:
-        # Look for numbers after "under" or "below"
-        under_match = re.search(r'(?:under|below)\s+\$?(\d+)', query_lower)
-        if under_match:
-            price_max = float(under_match.group(1))
-    
-    # Extract time constraint
-    time_max = None
-    time_match = re.search(r'(\d+)\s*(?:min|minute)', query_lower)
-    if time_match:
-        time_max = int(time_match.group(1))
-    elif "quick" in query_lower or "fast" in query_lower or "asap" in query_lower:
-        time_max = 20  # Assume quick means 20 minutes or less
-    
-    # Extract preferences
-    preferences = []
-    if "spicy" in query_lower or "hot" in query_lower:
-        preferences.append("spicy")
-    if "vegetarian" in query_lower or "veg" in query_lower:
-        preferences.append("vegetarian")
-    if "vegan" in query_lower:
-        preferences.append("vegan")
-    if "healthy" in query_lower:
-        preferences.append("healthy")
-    
-    # Detect favorites intent
-    use_favorites = "favorite" in query_lower or "usual" in query_lower or "regular" in query_lower
-    
-    # Detect urgency
-    urgency = None
-    if "hungry" in query_lower or "starving" in query_lower:
-        urgency = "high"
-    
-    # Determine intent
-    if use_favorites:
-        intent = "favorites"
-    elif dish or cuisines_found:
-        intent = "search"
-    elif urgency:
-        intent = "urgent"
-    else:
-        intent = "browse"
-    
-    return ParsedQuery(
-        intent=intent,
-        cuisine=cuisines_found if cuisines_found else None,
-        dish=dish,
-        price_max=price_max,
-        time_max=time_max,
-        preferences=preferences,
-        location=location,
-        use_favorites=use_favorites,
-        urgency=urgency
-    )
+    return ParsedQuery(location=location, **get_query_parser().parse(query))
 
-def filter_restaurants_by_query(parsed: ParsedQuery, restaurants: List[Dict]) -> List[Dict]:
+def select_restaurants_by_query(parsed: ParsedQuery, restaurants: List[Dict],
+                                item_matches: Optional[Dict[str, List[int]]] = None) -> List[Dict]:
     """
-    Filter restaurants based on parsed query
-    If price/dish/preferences specified, only return restaurants that have matching menu items
+    Keep the restaurants matching the parsed query (unordered)
+    If price/dish/preferences specified, only keep restaurants that have matching menu items
+    (their first matching item rows are recorded in item_matches, if given)
     """
-    results = restaurants.copy()
+    results = restaurants
     
     # Filter by cuisine
     if parsed.cuisine:
@@ -687,87 +915,145 @@ def filter_restaurants_by_query(parsed: ParsedQuery, restaurants: List[Dict]) ->
     
     # Filter by delivery time (use minimum time, not maximum, for better UX)
     if parsed.time_max:
-        filtered_by_time = []
-        for r in results:
-            try:
-                min_time = int(r["delivery_time"].split('-')[0].strip().split(' ')[0])
-                # Allow if minimum delivery time is within 5 minutes of requested time
-                if min_time <= parsed.time_max + 5:
-                    filtered_by_time.append(r)
-            except:
-                pass
-        results = filtered_by_time
+        # Allow if minimum delivery time is within 5 minutes of requested time
+        results = CATALOG_INDEX.filter_delivery_within(results, parsed.time_max + 5)
     
     # Filter by dish, price, or preferences - check if restaurant has matching menu items
     if parsed.dish or parsed.price_max or parsed.preferences:
+        item_filters = menu_item_filters(parsed)
         filtered_with_items = []
         for restaurant in results:
-            menu = MENUS.get(restaurant["id"], {"categories": []})
-            matching_items = filter_menu_items_by_query(parsed, menu)
-            if matching_items:  # Only include restaurant if it has matching items
+            # Menu summaries rule out most restaurants without touching their items
+            if not MENU_ITEM_STORE.may_match(restaurant["id"], **item_filters):
+                continue
+            rows = MENU_ITEM_STORE.match(restaurant["id"], limit=1, **item_filters)
+            if rows:  # Only include restaurant if it has matching items
                 filtered_with_items.append(restaurant)
+                if item_matches is not None:
+                    item_matches[restaurant["id"]] = rows
         results = filtered_with_items
     
-    # Sort by relevance
+    return results
+
+def rank_restaurants_by_query(parsed: ParsedQuery, restaurants: List[Dict], limit: Optional[int] = None) -> List[Dict]:
+    """
+    Order restaurants by relevance and keep the top `limit` (all if None)
+    """
+    # Sort by relevance (precomputed orderings, no per-row parsing)
     if parsed.urgency == "high":
         # Sort by fastest delivery
-        results.sort(key=lambda r: int(r["delivery_time"].split('-')[0].strip().split(' ')[0]))
-    else:
-        # Sort by rating
-        results.sort(key=lambda r: r["rating"], reverse=True)
-    
-    return results
+        return CATALOG_INDEX.sort_records(restaurants, by="delivery", limit=limit)
+    # Sort by rating
+    return CATALOG_INDEX.sort_records(restaurants, by="rating", limit=limit)
 
 def extract_max_delivery_time(delivery_time_str: str) -> int:
     """
     Extract maximum delivery time from string like '30-45 min'
     """
-    import re
-    match = re.search(r'(\d+)-(\d+)', delivery_time_str)
-    if match:
-        return int(match.group(2))
-    return 60  # Default to 60 if can't parse
+    _, max_minutes = parse_delivery_time(delivery_time_str)
+    return max_minutes if max_minutes is not None else 60  # Default to 60 if can't parse
+
+def menu_item_filters(parsed: ParsedQuery) -> Dict[str, Any]:
+    """Menu item store filters for a parsed query"""
+    return {
+        "dish": parsed.dish,
+        "price_max": parsed.price_max or None,
+        "spicy": "spicy" in parsed.preferences,
+        "vegetarian": "vegetarian" in parsed.preferences,
+    }
+
+# Parsed queries and search results, reused until the catalog changes
+SEARCH_CACHE = SearchCache()
+SEARCH_ENCODE = fast_encode_json if FAST_JSON else encode_json
 
-def filter_menu_items_by_query(parsed: ParsedQuery, menu: Dict) -> List[Dict]:
+def search_result_key(parsed: ParsedQuery, location: Optional[str], limit: int) -> tuple:
     """
-    Filter menu items based on parsed query - SIMPLIFIED for performance
+    Canonical result cache key: every parsed field in a fixed form (preferences
+    sorted, city case-folded like the catalog lookup), plus the limit.
     """
-    all_items = []
+    return (
+        parsed.intent,
+        tuple(parsed.cuisine) if parsed.cuisine else None,
+        parsed.dish,
+        parsed.price_max,
+        parsed.time_max,
+        tuple(sorted(parsed.preferences)),
+        parsed.use_favorites,
+        parsed.urgency,
+        (location or "").lower(),
+        limit,
+    )
+
+def run_intelligent_search(parsed: ParsedQuery, limit: int) -> Dict[str, Any]:
+    """Message, top restaurants and suggested items for a parsed query"""
+    # Step 2: Get restaurants by location
+    city = parsed.location
+    if city:
+        all_restaurants = get_restaurants_by_location(city=city)
+    else:
+        all_restaurants = RESTAURANTS
     
-    # Flatten menu items from all categories - limit to first 20 items for speed
-    for category in menu.get("categories", [])[:5]:  # Only first 5 categories
-        for item in category.get("items", [])[:10]:  # Only first 10 items per category
-            try:
-                item_dict = item.copy() if isinstance(item, dict) else item.dict()
-                item_dict["category"] = category.get("name", "")
-                all_items.append(item_dict)
-            except:
-                continue
+    logger.debug("[INTELLIGENT_SEARCH] Found %d restaurants in %s", len(all_restaurants), city)
+    
+    # Step 3: Filter by parsed criteria
+    item_matches: Dict[str, List[int]] = {}
+    filtered_restaurants = select_restaurants_by_query(parsed, all_restaurants, item_matches)
+    logger.debug("[INTELLIGENT_SEARCH] Filtered to %d restaurants", len(filtered_restaurants))
     
-    results = all_items
+    # Step 3b: Rank only as many as we return (top-k selection, not a full sort)
+    top_restaurants = rank_restaurants_by_query(parsed, filtered_restaurants, limit)
     
-    # Quick filters only
-    if parsed.dish and results:
-        dish_lower = parsed.dish.lower()
-        results = [item for item in results if dish_lower in item.get("name", "").lower()][:5]
+    # Step 4: Get suggested menu items (only if needed)
+    suggested_items = []
+    if parsed.dish or parsed.price_max or parsed.preferences:
+        for restaurant in top_restaurants[:2]:  # Top 2 only
+            # Reuse the rows found while filtering restaurants instead of re-filtering the menu
+            for row in item_matches.get(restaurant["id"], [])[:1]:  # Top 1 item per restaurant
+                item = MENU_ITEM_STORE.item(row)
+                suggested_items.append({
+                    "restaurant_id": restaurant["id"],
+                    "restaurant_name": restaurant["name"],
+                    "item_name": item.get("name", ""),
+                    "price": item.get("price", 0),
+                    "spicy": item.get("spicy", False),
+                    "vegetarian": item.get("vegetarian", False)
+                })
     
-    if parsed.price_max and results:
-        results = [item for item in results if item.get("price", 0) <= parsed.price_max][:5]
+    # Step 5: Build response
+    if not filtered_restaurants:
+        return {
+            "message": "No restaurants found matching your criteria",
+            "restaurants": [],
+            "suggested_items": []
+        }
     
-    if "spicy" in parsed.preferences and results:
-        results = [item for item in results if item.get("spicy", False)][:5]
+    # Success message
+    if parsed.dish:
+        message = f"Found {len(filtered_restaurants)} restaurants with {parsed.dish}"
+    elif parsed.cuisine:
+        cuisine_str = ", ".join(parsed.cuisine)
+        message = f"Found {len(filtered_restaurants)} {cuisine_str} restaurants"
+    else:
+        message = f"Found {len(filtered_restaurants)} restaurants"
     
-    if "vegetarian" in parsed.preferences and results:
-        results = [item for item in results if item.get("vegetarian", False)][:5]
+    logger.debug("[INTELLIGENT_SEARCH] Success - Returning %d restaurants", len(top_restaurants))
     
-    return results[:5]  # Return max 5 items
+    return {
+        "message": message,
+        "restaurants": top_restaurants,
+        "suggested_items": suggested_items
+    }
 
 @app.get(
     "/api/v1/search/intelligent",
     summary="Intelligent search with natural language",
     description="Search restaurants using complex natural language queries with multiple constraints"
 )
-async def intelligent_search(query: str = "test", location: str = "San Francisco"):
+async def intelligent_search(
+    query: str = "test",
+    location: str = "San Francisco",
+    limit: int = Query(5, ge=1, le=50, description="Maximum number of restaurants to return")
+):
     """
     Intelligent search using GET with query parameters
     
@@ -776,75 +1062,48 @@ async def intelligent_search(query: str = "test", location: str = "San Francisco
     - query: "Something spicy under $15 in 20 minutes"
     - query: "Pizza from my favorite restaurant"
     """
-    logger.info(f"[INTELLIGENT_SEARCH] Query: '{query}', Location: '{location}'")
+    logger.info("[INTELLIGENT_SEARCH] Query: '%s', Location: '%s'", query, location)
     
     try:
-        # Step 1: Parse the query
-        parsed = parse_natural_language_query(query, location)
-        logger.info(f"[INTELLIGENT_SEARCH] Parsed: {parsed.dict()}")
+        # Step 1: Parse the query (cached per raw query string, without the location)
+        parser = get_query_parser()
+        SEARCH_CACHE.sync(parser.version)
+        entry = SEARCH_CACHE.parsed.get(query)
+        if entry is MISSING:
+            unlocated = ParsedQuery(**parser.parse(query))
+            entry = (unlocated, unlocated.dict())
+            SEARCH_CACHE.parsed.put(query, entry)
+        unlocated, parsed_fields = entry
+        parsed_fields = dict(parsed_fields, location=location)
+        logger.debug("[INTELLIGENT_SEARCH] Parsed: %s", parsed_fields)
         
-        # Step 2: Get restaurants by location
-        if location or parsed.location:
-            city = location or parsed.location
-            all_restaurants = get_restaurants_by_location(city=city)
+        # Steps 2-5, cached per canonical parsed query as pre-encoded JSON
+        key = search_result_key(unlocated, location, limit)
+        cached = SEARCH_CACHE.results.get(key)
+        if cached is MISSING:
+            parsed = unlocated.model_copy(update={"location": location})
+            result = run_intelligent_search(parsed, limit)
+            tail = b"".join([
+                b',"restaurants":', SEARCH_ENCODE(jsonable_encoder(result["restaurants"])),
+                b',"suggested_items":', SEARCH_ENCODE(jsonable_encoder(result["suggested_items"])),
+                b"}",
+            ])
+            cached = (result["message"], tail)
+            SEARCH_CACHE.results.put(key, cached)
         else:
-            all_restaurants = RESTAURANTS
-        
-        logger.info(f"[INTELLIGENT_SEARCH] Found {len(all_restaurants)} restaurants in {city}")
-        
-        # Step 3: Filter by parsed criteria
-        filtered_restaurants = filter_restaurants_by_query(parsed, all_restaurants)
-        logger.info(f"[INTELLIGENT_SEARCH] Filtered to {len(filtered_restaurants)} restaurants")
-        
-        # Step 4: Get suggested menu items (only if needed)
-        suggested_items = []
-        if parsed.dish or parsed.price_max or parsed.preferences:
-            for restaurant in filtered_restaurants[:2]:  # Top 2 only
-                menu = MENUS.get(restaurant["id"], {"categories": []})
-                items = filter_menu_items_by_query(parsed, menu)
-                for item in items[:1]:  # Top 1 item per restaurant
-                    suggested_items.append({
-                        "restaurant_id": restaurant["id"],
-                        "restaurant_name": restaurant["name"],
-                        "item_name": item.get("name", ""),
-                        "price": item.get("price", 0),
-                        "spicy": item.get("spicy", False),
-                        "vegetarian": item.get("vegetarian", False)
-                    })
+            logger.debug("[INTELLIGENT_SEARCH] Result cache hit")
         
-        # Step 5: Build response
-        if not filtered_restaurants:
-            return {
-                "message": "No restaurants found matching your criteria",
-                "query": query,
-                "location": location,
-                "parsed": parsed.dict(),
-                "restaurants": [],
-                "suggested_items": []
-            }
-        
-        # Success message
-        if parsed.dish:
-            message = f"Found {len(filtered_restaurants)} restaurants with {parsed.dish}"
-        elif parsed.cuisine:
-            cuisine_str = ", ".join(parsed.cuisine)
-            message = f"Found {len(filtered_restaurants)} {cuisine_str} restaurants"
-        else:
-            message = f"Found {len(filtered_restaurants)} restaurants"
-        
-        logger.info(f"[INTELLIGENT_SEARCH] Success - Returning {len(filtered_restaurants[:5])} restaurants")
-        
-        return {
+        message, tail = cached
+        head = SEARCH_ENCODE({
             "message": message,
             "query": query,
             "location": location,
-            "parsed": parsed.dict(),
-            "restaurants": filtered_restaurants[:5],
-            "suggested_items": suggested_items
-        }
+            "parsed": parsed_fields,
+        })
+        return Response(content=head[:-1] + tail, media_type="application/json")
         
     except Exception as e:
-        logger.error(f"[INTELLIGENT_SEARCH] Error: {str(e)}")
+        logger.error("[INTELLIGENT_SEARCH] Error: %s", e)
         return {
             "message": f"Error processing query: {str(e)}",
             "query": query,
@@ -853,6 +1112,15 @@ async def intelligent_search(query: str = "test", location: str = "San Francisco
             "suggested_items": []
         }
 
+@app.get(
+    "/api/v1/search/cache/stats",
+    summary="Intelligent search cache statistics",
+    description="Entries, hits, misses and evictions of the parsed-query and search-result caches (for ops tooling)"
+)
+async def search_cache_stats():
+    """Counters of both intelligent search cache levels"""
+    return SEARCH_CACHE.stats()
+
 # Favorites Endpoints
 
 @app.get(
@@ -863,7 +1131,7 @@ async def intelligent_search(query: str = "test", location: str = "San Francisco
 )
 async def get_favorites():
     """Get user's favorite restaurants"""
-    logger.info("Getting favorite restaurants")
+    logger.debug("Getting favorite restaurants")
     favorites = get_favorite_restaurants()
     return favorites
 
@@ -874,7 +1142,7 @@ async def get_favorites():
 )
 async def add_restaurant_to_favorites(restaurant_id: str):
     """Add restaurant to favorites"""
-    logger.info(f"Adding restaurant to favorites: {restaurant_id}")
+    logger.info("Adding restaurant to favorites: %s", restaurant_id)
     result = add_favorite_restaurant(restaurant_id)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
@@ -887,7 +1155,7 @@ async def add_restaurant_to_favorites(restaurant_id: str):
 )
 async def remove_restaurant_from_favorites(restaurant_id: str):
     """Remove restaurant from favorites"""
-    logger.info(f"Removing restaurant from favorites: {restaurant_id}")
+    logger.info("Removing restaurant from favorites: %s", restaurant_id)
     result = remove_favorite_restaurant(restaurant_id)
     return result
 
@@ -898,7 +1166,7 @@ async def remove_restaurant_from_favorites(restaurant_id: str):
 )
 async def get_favorite_menu_items():
     """Get user's favorite menu items"""
-    logger.info("Getting favorite menu items")
+    logger.debug("Getting favorite menu items")
     favorites = get_favorite_items()
     return {"favorites": favorites}
 
@@ -913,7 +1181,7 @@ async def add_menu_item_to_favorites(
     item_name: str
 ):
     """Add menu item to favorites"""
-    logger.info(f"Adding item to favorites: {item_name} from {restaurant_id}")
+    logger.info("Adding item to favorites: %s from %s", item_name, restaurant_id)
     result = add_favorite_item(restaurant_id, item_id, item_name)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
@@ -929,7 +1197,7 @@ async def remove_menu_item_from_favorites(
     item_id: str
 ):
     """Remove menu item from favorites"""
-    logger.info(f"Removing item from favorites: {item_id} from {restaurant_id}")
+    logger.info("Removing item from favorites: %s from %s", item_id, restaurant_id)
     result = remove_favorite_item(restaurant_id, item_id)
     return result
 
@@ -0,0 +1,202 @@
+"""
+Flattened menu item store for intelligent search
+Menus are flattened once into columns so queries never copy or re-walk menu dicts
+"""
+
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Positions of the set bits in mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class MenuSummary(NamedTuple):
+    """Per-restaurant menu slice plus the aggregates used to prune restaurants"""
+    start: int
+    end: int
+    spicy_mask: int
+    vegetarian_mask: int
+    min_price: float
+    # Lowercase item names joined by newlines; a dish can only match an item if
+    # it is a substring of this blob
+    name_blob: str
+
+    @property
+    def has_spicy(self) -> bool:
+        return self.spicy_mask != 0
+
+    @property
+    def has_vegetarian(self) -> bool:
+        return self.vegetarian_mask != 0
+
+
+class MenuItemStore:
+    """
+    Column store of every menu item across all restaurants.
+
+    Each restaurant's items occupy one contiguous slice of the columns, in menu
+    order (categories in order, items in order). Per-restaurant bitmasks over
+    that slice answer the boolean filters (spicy, vegetarian) for every item at
+    once; price and dish checks then run only on the surviving items.
+
+    A MenuSummary per restaurant rules out restaurants that cannot match
+    (too expensive, no spicy/vegetarian items, dish not on the menu) before any
+    item is looked at.
+
+    Menus from a catalog snapshot (SnapshotMenus) are indexed from the
+    snapshot's item columns: their rows keep only an item number, and the item
+    is decoded from the mapped file when item() serves it.
+    """
+
+    def __init__(self, menus: Dict[str, Dict]):
+        self.rebuild(menus)
+
+    def rebuild(self, menus: Dict[str, Dict]):
+        """Drop all columns and re-flatten every menu"""
+        self.restaurant_ids: List[str] = []
+        self.names: List[str] = []
+        self.prices = array("d")
+        self.spicy = bytearray()
+        self.vegetarian = bytearray()
+        self.category_ids = array("l")
+        self.categories: List[str] = []
+        # Item dicts, or item numbers that _load_item decodes
+        self.items: List[Any] = []
+        self._load_item: Optional[Callable[[int], Dict]] = getattr(menus, "load_item", None)
+        self._category_lookup: Dict[str, int] = {}
+        self._summaries: Dict[str, MenuSummary] = {}
+        item_rows = getattr(menus, "item_rows", None)
+        for restaurant_id in menus:
+            rows = item_rows(restaurant_id) if item_rows is not None else None
+            if rows is None:
+                rows = self._menu_rows(menus[restaurant_id])
+            self._set_rows(restaurant_id, rows)
+
+    def set_menu(self, restaurant_id: str, menu: Dict):
+        """(Re)index a restaurant's menu; a replaced slice is left unreferenced until rebuild"""
+        self._set_rows(restaurant_id, self._menu_rows(menu))
+
+    @staticmethod
+    def _menu_rows(menu: Dict) -> Iterator[Tuple[str, str, float, bool, bool, Dict]]:
+        # (name, category, price, spicy, vegetarian, item) per item, in menu order
+        for category in menu.get("categories", []):
+            category_name = category.get("name", "")
+            for item in category.get("items", []):
+                yield (item.get("name", ""), category_name, float(item.get("price", 0) or 0),
+                       bool(item.get("spicy", False)), bool(item.get("vegetarian", False)), item)
+
+    def _set_rows(self, restaurant_id: str, rows: Iterable[Tuple[str, str, float, bool, bool, Any]]):
+        start = len(self.items)
+        for name, category, price, spicy, vegetarian, item in rows:
+            self.restaurant_ids.append(restaurant_id)
+            self.names.append(name.lower())
+            self.prices.append(price)
+            self.spicy.append(1 if spicy else 0)
+            self.vegetarian.append(1 if vegetarian else 0)
+            self.category_ids.append(self._intern_category(category))
+            self.items.append(item)
+        end = len(self.items)
+        self._summaries[restaurant_id] = MenuSummary(
+            start=start,
+            end=end,
+            spicy_mask=self._mask(self.spicy, start, end),
+            vegetarian_mask=self._mask(self.vegetarian, start, end),
+            min_price=min(self.prices[start:end], default=float("inf")),
+            name_blob="\n".join(self.names[start:end]),
+        )
+
+    def remove_menu(self, restaurant_id: str):
+        """Stop serving a restaurant's items"""
+        self._summaries.pop(restaurant_id, None)
+
+    def summary(self, restaurant_id: str) -> Optional[MenuSummary]:
+        """Menu summary for a restaurant, or None if it has no indexed menu"""
+        return self._summaries.get(restaurant_id)
+
+    def item_count(self, restaurant_id: str) -> int:
+        """Number of items on a restaurant's menu"""
+        summary = self._summaries.get(restaurant_id)
+        return summary.end - summary.start if summary else 0
+
+    def may_match(self, restaurant_id: str, dish: Optional[str] = None, price_max: Optional[float] = None,
+                  spicy: bool = False, vegetarian: bool = False) -> bool:
+        """
+        Cheap summary-only check: False means no item of this restaurant can match.
+        True means match() has to look at the items to be sure.
+        """
+        summary = self._summaries.get(restaurant_id)
+        if summary is None or summary.start == summary.end:
+            return False
+        if price_max is not None and summary.min_price > price_max:
+            return False
+        if spicy and not summary.spicy_mask:
+            return False
+        if vegetarian and not summary.vegetarian_mask:
+            return False
+        if spicy and vegetarian and not summary.spicy_mask & summary.vegetarian_mask:
+            return False
+        if dish and dish.lower() not in summary.name_blob:
+            return False
+        return True
+
+    def match(self, restaurant_id: str, dish: Optional[str] = None, price_max: Optional[float] = None,
+              spicy: bool = False, vegetarian: bool = False, limit: Optional[int] = None) -> List[int]:
+        """
+        Row numbers of the restaurant's items passing every given filter, in menu order.
+
+        - **dish**: case-insensitive substring of the item name
+        - **price_max**: item price must be at most this
+        - **spicy** / **vegetarian**: item must carry the flag
+        - **limit**: stop after this many matches
+        """
+        if not self.may_match(restaurant_id, dish, price_max, spicy, vegetarian):
+            return []
+        summary = self._summaries[restaurant_id]
+        start = summary.start
+        mask = (1 << (summary.end - start)) - 1
+        if spicy:
+            mask &= summary.spicy_mask
+        if vegetarian:
+            mask &= summary.vegetarian_mask
+        dish_lower = dish.lower() if dish else None
+        names, prices = self.names, self.prices
+        rows = []
+        for offset in iter_bits(mask):
+            row = start + offset
+            if price_max is not None and prices[row] > price_max:
+                continue
+            if dish_lower is not None and dish_lower not in names[row]:
+                continue
+            rows.append(row)
+            if limit is not None and len(rows) >= limit:
+                break
+        return rows
+
+    def item(self, row: int) -> Dict:
+        """The menu item at a row, copied and annotated with its category name"""
+        item = self.items[row]
+        item = self._load_item(item) if type(item) is int else dict(item)
+        item["category"] = self.categories[self.category_ids[row]]
+        return item
+
+    def _intern_category(self, name: str) -> int:
+        category_id = self._category_lookup.get(name)
+        if category_id is None:
+            category_id = len(self.categories)
+            self.categories.append(name)
+            self._category_lookup[name] = category_id
+        return category_id
+
+    @staticmethod
+    def _mask(column: bytearray, start: int, end: int) -> int:
+        # Bit i is set when the flag is set on the restaurant's i-th item
+        mask = 0
+        for offset in range(end - start):
+            if column[start + offset]:
+                mask |= 1 << offset
+        return mask
@@ -0,0 +1,82 @@
+"""
+Order change notifications for streaming and long-poll tracking
+Waiters are woken by order mutations or by timeline stage boundaries on a shared timer wheel
+"""
+
+import asyncio
+import threading
+from typing import Dict, Optional, Set
+
+from timer_wheel import TimerWheel
+
+# Changes written by the tracking timeline itself (see order_timeline.status_changes);
+# the timeline boundary already woke the waiters for these
+TIMELINE_FIELDS = frozenset({"status", "status_stage"})
+
+# Reasons a wait ends
+CHANGED = "changed"
+STAGE = "stage"
+TIMEOUT = "timeout"
+
+
+class OrderEventHub:
+    """
+    Per-order waiters, woken when an order is written or its next stage begins.
+
+    Register publish() as an order repository listener. Waits are one-shot
+    futures; all their timers (next stage boundary, timeout) live on one
+    TimerWheel, so open streams cost no asyncio timers of their own.
+    """
+
+    def __init__(self, wheel: Optional[TimerWheel] = None):
+        self.wheel = wheel if wheel is not None else TimerWheel()
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+
+    def watching(self, order_id: str) -> int:
+        """Number of waits currently open on an order"""
+        return len(self._waiters.get(order_id, ()))
+
+    def publish(self, order_id: str, changes: Dict):
+        """Repository listener: wake everyone waiting on this order"""
+        if order_id not in self._waiters or not changes.keys() - TIMELINE_FIELDS:
+            return
+        if threading.get_ident() == self._loop_thread:
+            self._wake(order_id, CHANGED)
+        elif self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake, order_id, CHANGED)
+
+    def _wake(self, order_id: str, reason: str):
+        for future in self._waiters.pop(order_id, ()):
+            if not future.done():
+                future.set_result(reason)
+
+    async def wait(self, order_id: str, next_stage_at: Optional[float], timeout: float) -> str:
+        """
+        Wait until the order changes (CHANGED), its next stage begins (STAGE),
+        or `timeout` seconds pass (TIMEOUT).
+        """
+        loop = asyncio.get_running_loop()
+        self._loop, self._loop_thread = loop, threading.get_ident()
+        future = loop.create_future()
+        waiters = self._waiters.setdefault(order_id, set())
+        waiters.add(future)
+
+        def resolve(reason: str):
+            if not future.done():
+                future.set_result(reason)
+
+        timers = [self.wheel.call_later(timeout, lambda: resolve(TIMEOUT))]
+        if next_stage_at is not None:
+            timers.append(self.wheel.call_at(next_stage_at, lambda: resolve(STAGE)))
+        try:
+            return await future
+        finally:
+            for timer in timers:
+                timer.cancel()
+            waiters = self._waiters.get(order_id)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[order_id]
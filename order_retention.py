@@ -0,0 +1,96 @@
+"""
+Order retention
+Periodically compacts delivered orders past their TTL so long-running workers stop growing
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from order_store import OrderRepository
+
+logger = logging.getLogger(__name__)
+
+
+class OrderRetentionSweeper:
+    """
+    Background task that archives orders delivered more than `ttl` seconds
+    ago and, only when `drop_after` is set, forgets archived orders delivered
+    more than that many seconds ago (they then read as missing). Backends
+    that keep nothing in memory (SQLite) treat it as a no-op.
+
+    Defaults come from ORDER_RETENTION_TTL (3600), ORDER_RETENTION_DROP_AFTER
+    (0 = keep archived orders forever) and ORDER_RETENTION_INTERVAL (60).
+    """
+
+    def __init__(self, repository: OrderRepository, ttl: Optional[float] = None,
+                 drop_after: Optional[float] = None, interval: Optional[float] = None):
+        self.repository = repository
+        self.ttl = ttl if ttl is not None else float(os.getenv("ORDER_RETENTION_TTL", "3600"))
+        if drop_after is None:
+            drop_after = float(os.getenv("ORDER_RETENTION_DROP_AFTER", "0"))
+        self.drop_after = drop_after or None
+        self.interval = interval if interval is not None else float(os.getenv("ORDER_RETENTION_INTERVAL", "60"))
+        self._task: Optional[asyncio.Task] = None
+        self.sweeps = 0
+        self.archived_total = 0
+        self.dropped_total = 0
+        self.last_sweep_ms = 0.0
+
+    def start(self):
+        """Start sweeping on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await loop.run_in_executor(None, self.sweep)
+            except Exception:
+                logger.exception("Order retention sweep failed")
+
+    def sweep(self, now: Optional[datetime] = None):
+        """Run one compaction pass; returns (archived, dropped)"""
+        started = time.perf_counter()
+        if now is None:
+            now = datetime.now()
+        # delivered_at is stored as naive local ISO text, so compare in the same form
+        archive_before = (now - timedelta(seconds=self.ttl)).isoformat()
+        drop_before = None
+        if self.drop_after is not None:
+            drop_before = (now - timedelta(seconds=self.drop_after)).isoformat()
+        archived, dropped = self.repository.compact(archive_before, drop_before)
+        self.sweeps += 1
+        self.archived_total += archived
+        self.dropped_total += dropped
+        self.last_sweep_ms = round((time.perf_counter() - started) * 1000, 3)
+        if archived or dropped:
+            logger.info("Order retention archived %d and dropped %d orders in %.1fms",
+                        archived, dropped, self.last_sweep_ms)
+        return archived, dropped
+
+    def stats(self) -> Dict:
+        """Resident/archived order counts and bytes plus sweeper totals"""
+        stats = dict(self.repository.memory_stats())
+        stats.update(
+            sweeps=self.sweeps,
+            archived_total=self.archived_total,
+            dropped_total=self.dropped_total,
+            last_sweep_ms=self.last_sweep_ms,
+        )
+        return stats
@@ -0,0 +1,145 @@
+"""
+Background order status progression
+Moves every active order along its timeline at the right moment, independent of polling
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from order_store import OrderRepository
+from order_timeline import TERMINAL_STATUSES, next_stage_at, project, status_changes
+from timer_wheel import TimerHandle, TimerWheel
+
+logger = logging.getLogger(__name__)
+
+# hook(order_id, old_status, new_status, order) after a transition has been written
+TransitionHook = Callable[[str, Optional[str], str, Dict], None]
+
+
+class OrderStatusScheduler:
+    """
+    Advances order statuses on a TimerWheel.
+
+    Each tracked order holds one timer, for its next stage boundary. When it
+    fires, the order's timeline is projected, the new status is written
+    through the repository (only if it changed) and the next timer is
+    scheduled; delivered and cancelled orders drop out. The timeline never
+    moves an order behind its stored status, so a status set by hand is only
+    ever advanced. Reads then always see the stored status, and idle orders
+    cost nothing between their transitions.
+
+    Subscribe with on_transition() to react to status changes (notifications,
+    streams, persistence); hooks run on the event loop and should not block.
+    Writes made from worker threads are handed over to the loop. With
+    `offload` (for storage that blocks on disk), orders are read and written
+    in the default executor and only the timers are kept on the loop.
+    """
+
+    def __init__(self, repository: OrderRepository, wheel: Optional[TimerWheel] = None, offload: bool = False):
+        self.repository = repository
+        self.wheel = wheel if wheel is not None else TimerWheel()
+        self.offload = offload
+        self._timers: Dict[str, TimerHandle] = {}
+        self._hooks: List[TransitionHook] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self.running = False
+        self.transitions = 0
+
+    def __len__(self):
+        return len(self._timers)
+
+    def on_transition(self, hook: TransitionHook):
+        """Call hook(order_id, old_status, new_status, order) after every scheduled transition"""
+        self._hooks.append(hook)
+
+    def start(self):
+        """Begin scheduling (on the running event loop), picking up every undelivered order"""
+        self.running = True
+        self._loop, self._loop_thread = asyncio.get_running_loop(), threading.get_ident()
+        for order_id in self.repository.undelivered_ids():
+            self.track(order_id)
+
+    def stop(self):
+        """Cancel all pending transitions"""
+        self.running = False
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+
+    def repository_listener(self, order_id: str, changes: Dict):
+        """
+        Repository listener: start tracking newly created orders, stop tracking
+        finished ones, and reschedule orders whose status was set from outside
+        the timeline (status changes, payment), since their pending timer may be
+        for a stage they have already reached or passed.
+        """
+        if not self._on_loop_thread():
+            # Written from a worker thread; timers live on the loop
+            self._loop.call_soon_threadsafe(self.repository_listener, order_id, changes)
+        elif changes.get("status") in TERMINAL_STATUSES:
+            self.untrack(order_id)
+        elif not self.running:
+            return
+        elif "created_at" in changes:
+            if order_id not in self._timers:
+                self.track(order_id, dict(changes))
+        elif "status" in changes and "status_stage" not in changes and order_id in self._timers:
+            self.track(order_id)
+
+    def untrack(self, order_id: str):
+        """Cancel the order's pending transition"""
+        timer = self._timers.pop(order_id, None)
+        if timer is not None:
+            timer.cancel()
+
+    def track(self, order_id: str, order: Optional[Dict] = None):
+        """Bring the order up to date now and schedule its next transition"""
+        if not self.running:
+            return
+        if self.offload and self._loop_thread == threading.get_ident():
+            self._loop.run_in_executor(None, self._track_in_worker, order_id, order)
+            return
+        if order is None:
+            order = self.repository.get(order_id)
+        if order is None or order.get("status") in TERMINAL_STATUSES:
+            self._call_on_loop(self.untrack, order_id)
+            return
+        state = project(order)
+        changes = status_changes(order, state)
+        if changes:
+            old_status = order.get("status")
+            order = self.repository.update(order_id, changes) or order
+            self.transitions += 1
+            self._call_on_loop(self._notify, order_id, old_status, state.status, order)
+        self._call_on_loop(self._schedule, order_id, next_stage_at(order, state))
+
+    def _track_in_worker(self, order_id: str, order: Optional[Dict]):
+        try:
+            self.track(order_id, order)
+        except Exception:
+            logger.exception("Order status update failed for %s", order_id)
+
+    def _schedule(self, order_id: str, when: Optional[float]):
+        self.untrack(order_id)
+        if when is not None and self.running:
+            self._timers[order_id] = self.wheel.call_at(when, lambda: self.track(order_id))
+
+    def _on_loop_thread(self) -> bool:
+        return self._loop_thread is None or threading.get_ident() == self._loop_thread
+
+    def _call_on_loop(self, callback: Callable, *args):
+        if self._on_loop_thread():
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def _notify(self, order_id: str, old_status: Optional[str], new_status: str, order: Dict):
+        for hook in self._hooks:
+            try:
+                hook(order_id, old_status, new_status, order)
+            except Exception:
+                logger.exception("Order transition hook failed for %s", order_id)
+
@@ -0,0 +1,747 @@
+"""
+Order storage
+Collision-free, time-ordered order ids, pluggable storage backends (in-memory
+or SQLite) and the order repository the API goes through
+"""
+
+import copy
+import heapq
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from bisect import bisect_left, insort
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Crockford base32 (no I, L, O, U), as used by ULID
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+
+def _encode_base32(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class OrderIdGenerator:
+    """
+    ULID-style order ids: 48-bit millisecond timestamp + 80 random bits.
+
+    Ids are 26 Crockford base32 characters, so they sort lexicographically in
+    creation order and never run out of digits. Within one millisecond (or if
+    the clock steps backwards) the random part is incremented instead of
+    redrawn, keeping ids strictly increasing per process. Separate processes
+    draw independent randomness; a forked worker drops the state it inherited
+    from its parent so the two never continue the same sequence.
+    """
+
+    def __init__(self, prefix: str = "order_", clock: Callable[[], int] = time.time_ns):
+        self.prefix = prefix
+        self._clock = clock
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._random = 0
+
+    def new_id(self) -> str:
+        """Next id, strictly greater than every id this process handed out before"""
+        with self._lock:
+            now_ms = self._clock() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._random = int.from_bytes(os.urandom(_RANDOM_BITS // 8), "big")
+            elif self._random < _RANDOM_MAX:
+                self._random += 1
+            else:
+                # Random part exhausted within this millisecond: borrow the next one
+                self._last_ms += 1
+                self._random = int.from_bytes(os.urandom(_RANDOM_BITS // 8), "big")
+            timestamp, randomness = self._last_ms, self._random
+        return self.prefix + _encode_base32(timestamp, 10) + _encode_base32(randomness, 16)
+
+
+class OrderStorage:
+    """
+    Storage backend interface.
+
+    Backends store whole order dicts keyed by id. Every method is safe to call
+    from any thread; update() applies its changes atomically.
+    """
+
+    # True if every write is committed to disk (worth batching writes for)
+    durable = False
+
+    def add(self, order: Dict) -> Dict:
+        """Store a new order; raises KeyError if the id is taken"""
+        raise NotImplementedError
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        """A copy of the order, or None"""
+        raise NotImplementedError
+
+    def update(self, order_id: str, changes: Dict) -> Optional[Dict]:
+        """Apply field changes atomically; returns the updated order, or None if it does not exist"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Number of stored orders"""
+        raise NotImplementedError
+
+    def undelivered_ids(self) -> List[str]:
+        """Ids of orders whose status is not yet delivered"""
+        raise NotImplementedError
+
+    def get_many(self, order_ids: List[str]) -> Dict[str, Dict]:
+        """Copies of the orders that exist, keyed by id"""
+        orders = {}
+        for order_id in order_ids:
+            order = self.get(order_id)
+            if order is not None:
+                orders[order_id] = order
+        return orders
+
+    def query(self, status: Optional[str] = None, restaurant_id: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Orders matching every given filter, oldest first.
+        since / until bound created_at (ISO format; since inclusive, until exclusive).
+        """
+        raise NotImplementedError
+
+    def status_counts(self) -> Dict[Optional[str], int]:
+        """Number of orders per status"""
+        raise NotImplementedError
+
+    def compact(self, archive_before: str, drop_before: Optional[str] = None) -> Tuple[int, int]:
+        """Shrink old delivered orders held in memory; returns (archived, dropped). No-op by default."""
+        return 0, 0
+
+    def memory_stats(self) -> Dict[str, int]:
+        """Order counts and approximate bytes held in process memory"""
+        return {}
+
+    def apply_batch(self, writes: List[Tuple]) -> List:
+        """
+        Apply ("add", order) / ("update", order_id, changes) writes in order.
+        Returns one result (or the exception it raised) per write.
+        """
+        results = []
+        for write in writes:
+            try:
+                results.append(self.add(write[1]) if write[0] == "add" else self.update(write[1], write[2]))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def close(self):
+        """Release connections and background threads"""
+
+
+def order_matches(order: Dict, status: Optional[str] = None, restaurant_id: Optional[str] = None,
+                  since: Optional[str] = None, until: Optional[str] = None) -> bool:
+    """Whether an order passes the query() filters"""
+    if status is not None and order.get("status") != status:
+        return False
+    if restaurant_id is not None and order.get("restaurant_id") != restaurant_id:
+        return False
+    created_at = order.get("created_at") or ""
+    if since is not None and created_at < since:
+        return False
+    if until is not None and created_at >= until:
+        return False
+    return True
+
+
+class OrderIndex:
+    """
+    Secondary indexes over orders: status -> ids, restaurant_id -> ids,
+    (created_at, id) pairs kept sorted for time-range queries, and
+    (delivered_at, id) pairs of delivered orders for retention.
+
+    ISO timestamps in one format sort lexicographically in time order, so the
+    created_at strings are used as stored. Not thread-safe on its own; the
+    owning storage updates it under the same lock as the orders.
+    """
+
+    def __init__(self, orders: Iterable[Dict] = ()):
+        self.by_status: Dict[Optional[str], Set[str]] = {}
+        self.by_restaurant: Dict[Optional[str], Set[str]] = {}
+        self._created: List[Tuple[str, str]] = []
+        self._created_at: Dict[str, str] = {}
+        self._delivered: List[Tuple[str, str]] = []
+        self._delivered_at: Dict[str, str] = {}
+        for order in orders:
+            self.add(order)
+
+    def add(self, order: Dict):
+        order_id = order["id"]
+        self.by_status.setdefault(order.get("status"), set()).add(order_id)
+        self.by_restaurant.setdefault(order.get("restaurant_id"), set()).add(order_id)
+        created_at = order.get("created_at") or ""
+        self._created_at[order_id] = created_at
+        entry = (created_at, order_id)
+        # Orders almost always arrive in creation order, so this is an append
+        if not self._created or self._created[-1] <= entry:
+            self._created.append(entry)
+        else:
+            insort(self._created, entry)
+        if order.get("status") == "delivered":
+            delivered_at = order.get("delivered_at") or ""
+            self._delivered_at[order_id] = delivered_at
+            insort(self._delivered, (delivered_at, order_id))
+
+    def update(self, before: Dict, after: Dict):
+        """Re-file an order whose indexed fields may have changed"""
+        if (before.get("status") == after.get("status")
+                and before.get("restaurant_id") == after.get("restaurant_id")
+                and before.get("created_at") == after.get("created_at")
+                and before.get("delivered_at") == after.get("delivered_at")):
+            return
+        self.remove(before)
+        self.add(after)
+
+    def remove(self, order: Dict):
+        order_id = order["id"]
+        for postings, key in ((self.by_status, order.get("status")), (self.by_restaurant, order.get("restaurant_id"))):
+            ids = postings.get(key)
+            if ids is not None:
+                ids.discard(order_id)
+                if not ids:
+                    del postings[key]
+        for entries, times in ((self._created, self._created_at), (self._delivered, self._delivered_at)):
+            at = times.pop(order_id, None)
+            if at is not None:
+                position = bisect_left(entries, (at, order_id))
+                if position < len(entries) and entries[position] == (at, order_id):
+                    del entries[position]
+
+    def status_counts(self) -> Dict[Optional[str], int]:
+        """Number of orders per status"""
+        return {status: len(ids) for status, ids in self.by_status.items()}
+
+    def delivered_before(self, before: str) -> List[str]:
+        """Ids of delivered orders whose delivered_at is before `before` (ISO timestamp), oldest first"""
+        return [order_id for _, order_id in self._delivered[:bisect_left(self._delivered, (before, ""))]]
+
+    def query(self, status: Optional[str] = None, restaurant_id: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None, limit: Optional[int] = None) -> List[str]:
+        """Ids matching every given filter, oldest first"""
+        postings = []
+        if status is not None:
+            postings.append(self.by_status.get(status, set()))
+        if restaurant_id is not None:
+            postings.append(self.by_restaurant.get(restaurant_id, set()))
+        if not postings:
+            # Pure time range: slice the sorted list
+            start = bisect_left(self._created, (since, "")) if since is not None else 0
+            stop = bisect_left(self._created, (until, "")) if until is not None else len(self._created)
+            if limit is not None:
+                stop = min(stop, start + limit)
+            return [order_id for _, order_id in self._created[start:stop]]
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:]) if len(postings) > 1 else postings[0]
+        created_at = self._created_at
+        entries = [(created_at[order_id], order_id) for order_id in candidates]
+        if since is not None:
+            entries = [entry for entry in entries if entry[0] >= since]
+        if until is not None:
+            entries = [entry for entry in entries if entry[0] < until]
+        if limit is not None and limit < len(entries):
+            entries = heapq.nsmallest(limit, entries)
+        else:
+            entries.sort()
+        return [order_id for _, order_id in entries]
+
+
+def _deep_size(obj, seen: Optional[Set[int]] = None) -> int:
+    # Approximate bytes held by a JSON-like object, counting shared objects once
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(key, seen) + _deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    return size
+
+
+class InMemoryOrderStorage(OrderStorage):
+    """
+    Process-local dict of orders guarded by one lock.
+
+    Orders are deep-copied on the way in and out, so callers never observe an
+    order halfway through an update and cannot change stored orders (or their
+    nested items and address) except through update().
+
+    compact() moves orders delivered long enough ago out of the resident dict
+    into an archive of compressed JSON blobs (and can drop archived ones
+    entirely later). They stay indexed and readable; updating one inflates it
+    back. Orders get a delivered_at timestamp when they become delivered, so
+    they age from delivery rather than from creation.
+    """
+
+    def __init__(self, orders: Optional[Dict[str, Dict]] = None):
+        self._orders = orders if orders is not None else {}
+        self._archive: Dict[str, bytes] = {}
+        self._archive_bytes = 0
+        self._lock = threading.Lock()
+        self.index = OrderIndex(self._orders.values())
+
+    def _load(self, order_id: str) -> Optional[Dict]:
+        # Caller holds the lock; returns a copy
+        order = self._orders.get(order_id)
+        if order is not None:
+            return copy.deepcopy(order)
+        blob = self._archive.get(order_id)
+        return json.loads(zlib.decompress(blob)) if blob is not None else None
+
+    def add(self, order: Dict) -> Dict:
+        with self._lock:
+            if order["id"] in self._orders or order["id"] in self._archive:
+                raise KeyError(f"Order {order['id']} already exists")
+            order = copy.deepcopy(order)
+            if order.get("status") == "delivered" and not order.get("delivered_at"):
+                order["delivered_at"] = datetime.now().isoformat()
+            self._orders[order["id"]] = order
+            self.index.add(order)
+            return copy.deepcopy(order)
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._load(order_id)
+
+    def update(self, order_id: str, changes: Dict) -> Optional[Dict]:
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                blob = self._archive.pop(order_id, None)
+                if blob is None:
+                    return None
+                self._archive_bytes -= len(blob)
+                order = self._orders[order_id] = json.loads(zlib.decompress(blob))
+            before = dict(order)
+            order.update(copy.deepcopy(changes))
+            if order.get("status") == "delivered" and before.get("status") != "delivered" \
+                    and "delivered_at" not in changes:
+                # created_at-style naive local time, as the retention sweeper compares
+                order["delivered_at"] = datetime.now().isoformat()
+            self.index.update(before, order)
+            return copy.deepcopy(order)
+
+    def count(self) -> int:
+        return len(self._orders) + len(self._archive)
+
+    def get_many(self, order_ids: List[str]) -> Dict[str, Dict]:
+        with self._lock:
+            orders = {}
+            for order_id in order_ids:
+                order = self._load(order_id)
+                if order is not None:
+                    orders[order_id] = order
+            return orders
+
+    def query(self, status: Optional[str] = None, restaurant_id: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        with self._lock:
+            order_ids = self.index.query(status=status, restaurant_id=restaurant_id, since=since, until=until, limit=limit)
+            return [self._load(order_id) for order_id in order_ids]
+
+    def status_counts(self) -> Dict[Optional[str], int]:
+        with self._lock:
+            return self.index.status_counts()
+
+    def undelivered_ids(self) -> List[str]:
+        with self._lock:
+            return [order_id for order_id, order in self._orders.items() if order.get("status") != "delivered"]
+
+    def compact(self, archive_before: str, drop_before: Optional[str] = None, chunk: int = 500) -> Tuple[int, int]:
+        """
+        Archive resident orders delivered before archive_before, and forget
+        orders that were already archived and delivered before drop_before
+        (ISO timestamps). Works in chunks so writers are never locked out for
+        long. Returns (archived, dropped).
+        """
+        with self._lock:
+            to_drop = self.index.delivered_before(drop_before) if drop_before is not None else []
+            to_archive = self.index.delivered_before(archive_before)
+        archived = dropped = 0
+        # Drop first, so an order archived by this pass is kept until a later one
+        for start in range(0, len(to_drop), chunk):
+            with self._lock:
+                for order_id in to_drop[start:start + chunk]:
+                    blob = self._archive.get(order_id)
+                    if blob is None:
+                        continue
+                    order = json.loads(zlib.decompress(blob))
+                    if order.get("status") != "delivered":
+                        continue
+                    del self._archive[order_id]
+                    self._archive_bytes -= len(blob)
+                    self.index.remove(order)
+                    dropped += 1
+        for start in range(0, len(to_archive), chunk):
+            with self._lock:
+                for order_id in to_archive[start:start + chunk]:
+                    order = self._orders.get(order_id)
+                    if order is None or order.get("status") != "delivered":
+                        continue
+                    blob = zlib.compress(json.dumps(order, separators=(",", ":")).encode("utf-8"))
+                    self._archive[order_id] = blob
+                    self._archive_bytes += len(blob)
+                    del self._orders[order_id]
+                    archived += 1
+        return archived, dropped
+
+    def memory_stats(self) -> Dict[str, int]:
+        """Resident and archived order counts and approximate bytes (walks every resident order)"""
+        with self._lock:
+            resident = list(self._orders.values())
+            archived, archived_bytes = len(self._archive), self._archive_bytes
+        return {
+            "resident_orders": len(resident),
+            "resident_bytes": sum(_deep_size(order) for order in resident),
+            "archived_orders": archived,
+            "archived_bytes": archived_bytes,
+        }
+
+
+# Constant SQL text: sqlite3 keeps each connection's compiled statements in a
+# per-connection cache keyed by the text, so these are prepared once per connection
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id TEXT PRIMARY KEY,
+    restaurant_id TEXT,
+    status TEXT,
+    created_at TEXT,
+    data TEXT NOT NULL
+)
+"""
+# Secondary indexes for query(); created_at last so range scans come back in order
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS orders_by_status ON orders (status, created_at)",
+    "CREATE INDEX IF NOT EXISTS orders_by_restaurant ON orders (restaurant_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS orders_by_created ON orders (created_at)",
+)
+_INSERT_ORDER = "INSERT INTO orders (id, restaurant_id, status, created_at, data) VALUES (?, ?, ?, ?, ?)"
+_SELECT_ORDER = "SELECT data FROM orders WHERE id = ?"
+_UPDATE_ORDER = "UPDATE orders SET restaurant_id = ?, status = ?, created_at = ?, data = ? WHERE id = ?"
+_COUNT_ORDERS = "SELECT COUNT(*) FROM orders"
+_COUNT_BY_STATUS = "SELECT status, COUNT(*) FROM orders GROUP BY status"
+_SELECT_MANY_CHUNK = 200
+_SELECT_MANY = "SELECT id, data FROM orders WHERE id IN (" + ", ".join("?" * _SELECT_MANY_CHUNK) + ")"
+_SELECT_UNDELIVERED = "SELECT id FROM orders WHERE status IS NULL OR status != 'delivered'"
+
+
+def _order_row(order: Dict) -> Tuple:
+    return (order.get("restaurant_id"), order.get("status"), order.get("created_at"),
+            json.dumps(order, separators=(",", ":")))
+
+
+class SQLiteOrderStorage(OrderStorage):
+    """
+    Orders persisted in a SQLite database in WAL mode, shareable by every worker on the box.
+
+    - Reads borrow a connection from a small pool; in WAL mode they never wait for writers.
+    - Writes are handed to one writer thread per process, which drains every
+      pending write into a single transaction and commits once (group commit),
+      so concurrent writers share one fsync instead of queueing for their own.
+    - Each write transaction starts with BEGIN IMMEDIATE, so read-modify-write
+      updates stay atomic across processes.
+    - Connections and the writer are created lazily and re-created after a fork.
+    """
+
+    durable = True
+
+    def __init__(self, path: str, pool_size: int = 4, max_batch: int = 256, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.pool_size = pool_size
+        self.max_batch = max_batch
+        self.busy_timeout_ms = busy_timeout_ms
+        self._pid = None
+        self._start_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            for statement in _INDEXES:
+                conn.execute(statement)
+        conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None,
+                               check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        return conn
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._pool: queue.Queue = queue.Queue()
+            for _ in range(self.pool_size):
+                self._pool.put(self._connect())
+            self._writes: queue.Queue = queue.Queue()
+            self._writer = threading.Thread(target=self._write_loop, args=(self._connect(), self._writes),
+                                            name="order-writer", daemon=True)
+            self._writer.start()
+            self._pid = os.getpid()
+
+    # Reads
+
+    def _read(self, sql: str, params: Tuple = ()):
+        self._ensure_started()
+        conn = self._pool.get()
+        try:
+            return conn.execute(sql, params).fetchone()
+        finally:
+            self._pool.put(conn)
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        row = self._read(_SELECT_ORDER, (order_id,))
+        return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        return self._read(_COUNT_ORDERS)[0]
+
+    def _read_all(self, sql: str, params: Tuple = ()) -> List:
+        self._ensure_started()
+        conn = self._pool.get()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            self._pool.put(conn)
+
+    def undelivered_ids(self) -> List[str]:
+        return [row[0] for row in self._read_all(_SELECT_UNDELIVERED)]
+
+    def get_many(self, order_ids: List[str]) -> Dict[str, Dict]:
+        orders = {}
+        for start in range(0, len(order_ids), _SELECT_MANY_CHUNK):
+            chunk = list(order_ids[start:start + _SELECT_MANY_CHUNK])
+            # Pad to the fixed chunk size so every lookup reuses one prepared statement
+            chunk += [None] * (_SELECT_MANY_CHUNK - len(chunk))
+            for order_id, data in self._read_all(_SELECT_MANY, tuple(chunk)):
+                orders[order_id] = json.loads(data)
+        return orders
+
+    def query(self, status: Optional[str] = None, restaurant_id: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        conditions, params = [], []
+        for condition, value in (("status = ?", status), ("restaurant_id = ?", restaurant_id),
+                                 ("created_at >= ?", since), ("created_at < ?", until)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        sql = "SELECT data FROM orders"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY created_at, id LIMIT ?"
+        params.append(-1 if limit is None else limit)
+        return [json.loads(row[0]) for row in self._read_all(sql, tuple(params))]
+
+    def status_counts(self) -> Dict[Optional[str], int]:
+        return dict(self._read_all(_COUNT_BY_STATUS))
+
+    # Writes
+
+    def _submit(self, op: str, *args):
+        self._ensure_started()
+        future: Future = Future()
+        self._writes.put((op, args, future))
+        return future.result()
+
+    def apply_batch(self, writes: List[Tuple]) -> List:
+        # Enqueued back to back, so the writer commits them together
+        self._ensure_started()
+        futures = []
+        for op, *args in writes:
+            future: Future = Future()
+            self._writes.put((op, tuple(args), future))
+            futures.append(future)
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def add(self, order: Dict) -> Dict:
+        return self._submit("add", dict(order))
+
+    def update(self, order_id: str, changes: Dict) -> Optional[Dict]:
+        return self._submit("update", order_id, dict(changes))
+
+    def _write_loop(self, conn: sqlite3.Connection, writes: queue.Queue):
+        while True:
+            batch: List = [writes.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(writes.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(op is None for op, _, _ in batch)
+            batch = [write for write in batch if write[0] is not None]
+            if batch:
+                self._commit_batch(conn, batch)
+            if stop:
+                conn.close()
+                return
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: List):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, args, future in batch:
+                try:
+                    results.append((future, self._apply(conn, op, *args), None))
+                except Exception as e:  # Fails this write only; a failed statement does not abort the transaction
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, op: str, *args):
+        if op == "add":
+            order = args[0]
+            try:
+                conn.execute(_INSERT_ORDER, (order["id"],) + _order_row(order))
+            except sqlite3.IntegrityError:
+                raise KeyError(f"Order {order['id']} already exists")
+            return order
+        order_id, changes = args
+        row = conn.execute(_SELECT_ORDER, (order_id,)).fetchone()
+        if row is None:
+            return None
+        order = json.loads(row[0])
+        order.update(changes)
+        conn.execute(_UPDATE_ORDER, _order_row(order) + (order_id,))
+        return order
+
+    def close(self):
+        if self._pid != os.getpid():
+            return
+        self._writes.put((None, (), None))
+        self._writer.join()
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+        self._pid = None
+
+
+def create_order_storage(kind: Optional[str] = None, path: Optional[str] = None,
+                         orders: Optional[Dict[str, Dict]] = None) -> OrderStorage:
+    """
+    Storage backend selected by ORDER_STORAGE ("memory" or "sqlite", default memory).
+
+    - **path**: SQLite database file (default: ORDER_DB_PATH env var, else orders.db)
+    - **orders**: backing dict for the in-memory backend
+    """
+    kind = (kind or os.getenv("ORDER_STORAGE", "memory")).lower()
+    if kind == "sqlite":
+        return SQLiteOrderStorage(path or os.getenv("ORDER_DB_PATH", "orders.db"))
+    if kind == "memory":
+        return InMemoryOrderStorage(orders)
+    raise ValueError(f"Unknown order storage backend: {kind}")
+
+
+class OrderRepository:
+    """Order ids plus storage: the single entry point for reading and writing orders"""
+
+    def __init__(self, storage: Optional[OrderStorage] = None, id_generator: Optional[OrderIdGenerator] = None):
+        self.storage = storage or InMemoryOrderStorage()
+        self.id_generator = id_generator or OrderIdGenerator()
+        self._listeners: List[Callable[[str, Dict], None]] = []
+
+    def add_listener(self, listener: Callable[[str, Dict], None]):
+        """Call listener(order_id, changes) after every successful write (a new order counts as all changes)"""
+        self._listeners.append(listener)
+
+    def _notify(self, order_id: str, changes: Dict):
+        for listener in self._listeners:
+            listener(order_id, changes)
+
+    def __len__(self):
+        return self.storage.count()
+
+    def __contains__(self, order_id: str) -> bool:
+        return self.storage.get(order_id) is not None
+
+    def next_id(self) -> str:
+        """Allocate a new order id"""
+        return self.id_generator.new_id()
+
+    def undelivered_ids(self) -> List[str]:
+        """Ids of orders that are not delivered yet"""
+        return self.storage.undelivered_ids()
+
+    def get_many(self, order_ids: List[str]) -> Dict[str, Dict]:
+        """Copies of the orders that exist, keyed by id"""
+        return self.storage.get_many(order_ids)
+
+    def query(self, status: Optional[str] = None, restaurant_id: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Orders matching every given filter, oldest first (since/until: created_at range, ISO format)"""
+        return self.storage.query(status=status, restaurant_id=restaurant_id, since=since, until=until, limit=limit)
+
+    def status_counts(self) -> Dict[Optional[str], int]:
+        """Number of orders per status"""
+        return self.storage.status_counts()
+
+    def add(self, order: Dict) -> Dict:
+        """Store a new order (allocating its id if it has none); raises KeyError if the id is taken"""
+        order["id"] = order.get("id") or self.next_id()
+        stored = self.storage.add(order)
+        self._notify(stored["id"], stored)
+        return stored
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        """A copy of the order, or None"""
+        return self.storage.get(order_id)
+
+    def update(self, order_id: str, changes: Dict) -> Optional[Dict]:
+        """Apply field changes atomically; returns the updated order, or None if it does not exist"""
+        order = self.storage.update(order_id, changes)
+        if order is not None:
+            self._notify(order_id, changes)
+        return order
+
+    def compact(self, archive_before: str, drop_before: Optional[str] = None) -> Tuple[int, int]:
+        """Shrink old delivered orders held in memory; returns (archived, dropped)"""
+        return self.storage.compact(archive_before, drop_before)
+
+    def memory_stats(self) -> Dict[str, int]:
+        """Order counts and approximate bytes held in process memory"""
+        return self.storage.memory_stats()
+
+    def close(self):
+        """Flush and release the storage backend"""
+        self.storage.close()
@@ -0,0 +1,131 @@
+"""
+Order status timeline
+Each order gets its stage transition times at creation; tracking is a binary search over them
+"""
+
+import time
+from bisect import bisect_right
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+
+class Stage(NamedTuple):
+    status: str
+    message: str
+    starts_at_minutes: int
+    eta_minutes: int
+
+
+# DEMO MODE: 12 mins total, 6 stages x 2 minutes each
+STAGES = (
+    Stage("pending", "Order received! Waiting for restaurant confirmation.", 0, 12),
+    Stage("confirmed", "Restaurant confirmed your order!", 2, 10),
+    Stage("preparing", "Your food is being prepared! 🍳", 4, 8),
+    Stage("ready_for_pickup", "Order is ready! Waiting for delivery driver.", 6, 6),
+    Stage("out_for_delivery", "On the way to you! 🚚", 8, 4),
+    Stage("out_for_delivery", "Almost there! Driver is nearby! 🚚", 10, 2),
+    Stage("delivered", "Delivered! Enjoy your meal! 🍽️", 12, 0),
+)
+
+# Statuses the timeline never moves an order out of
+TERMINAL_STATUSES = frozenset({"delivered", "cancelled"})
+
+# First stage of each status on the timeline
+_STATUS_STAGE: Dict[str, int] = {}
+for _index, _stage in enumerate(STAGES):
+    _STATUS_STAGE.setdefault(_stage.status, _index)
+
+
+class TrackingState(NamedTuple):
+    """Where an order is on its timeline at a given moment"""
+    stage: int
+    status: str
+    message: str
+    eta_minutes: int
+    elapsed_minutes: int
+    estimated_delivery: str
+
+
+def build_schedule(created: float) -> List[float]:
+    """Epoch timestamps at which each stage begins, for an order created at `created`"""
+    return [created + stage.starts_at_minutes * 60 for stage in STAGES]
+
+
+@lru_cache(maxsize=4096)
+def _schedule_from_created_at(created_at: str) -> tuple:
+    return tuple(build_schedule(datetime.fromisoformat(created_at).timestamp()))
+
+
+def order_schedule(order: Dict) -> List[float]:
+    """The order's stored schedule, or one derived from created_at for orders stored without it"""
+    schedule = order.get("status_schedule")
+    if schedule:
+        return schedule
+    created_at = order.get("created_at")
+    if not created_at:
+        return build_schedule(time.time())
+    return _schedule_from_created_at(created_at)
+
+
+@lru_cache(maxsize=1024)
+def _clock_time(epoch_minute: int) -> str:
+    return datetime.fromtimestamp(epoch_minute * 60).strftime("%I:%M %p")
+
+
+def project(order: Dict, now: Optional[float] = None) -> TrackingState:
+    """
+    The order's tracking state at `now` (default: current time); reads only.
+
+    The timeline only moves an order forward: when its stored status is
+    further along than the schedule (set by hand, say), the state is that
+    status's stage, and a cancelled order stays cancelled.
+    """
+    if now is None:
+        now = time.time()
+    schedule = order_schedule(order)
+    index = max(0, bisect_right(schedule, now) - 1)
+    status = order.get("status")
+    elapsed_minutes = int((now - schedule[0]) / 60)
+    if status in TERMINAL_STATUSES and status not in _STATUS_STAGE:
+        return TrackingState(
+            stage=index,
+            status=status,
+            message=f"Order {status}.",
+            eta_minutes=0,
+            elapsed_minutes=elapsed_minutes,
+            estimated_delivery=status.capitalize(),
+        )
+    index = max(index, _STATUS_STAGE.get(status, -1))
+    stage = STAGES[index]
+    if stage.eta_minutes > 0:
+        estimated_delivery = _clock_time(int(now // 60) + stage.eta_minutes)
+    else:
+        estimated_delivery = "Delivered"
+    return TrackingState(
+        stage=index,
+        status=stage.status,
+        message=stage.message,
+        eta_minutes=stage.eta_minutes,
+        elapsed_minutes=elapsed_minutes,
+        estimated_delivery=estimated_delivery,
+    )
+
+
+def next_stage_at(order: Dict, state: TrackingState) -> Optional[float]:
+    """When the stage after `state` begins, or None once the order is delivered or cancelled"""
+    schedule = order_schedule(order)
+    if state.status in TERMINAL_STATUSES or state.stage + 1 >= len(schedule):
+        return None
+    return schedule[state.stage + 1]
+
+
+def status_changes(order: Dict, state: TrackingState) -> Optional[Dict]:
+    """
+    Fields to persist when the order has crossed into a stage with a new status
+    since the last write, else None (the common case: nothing to write).
+    project() never falls behind the stored status, so this only moves it forward.
+    """
+    if order.get("status") == state.status:
+        return None
+    return {"status": state.status, "status_stage": state.stage}
@@ -0,0 +1,199 @@
+"""
+Compiled natural language query parser for intelligent search
+All keyword and pattern matching is compiled once and reused for every query
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Common dishes, in priority order (the first one found in a query wins)
+COMMON_DISHES = [
+    # Indian dishes (match our menu)
+    "chicken tikka masala", "chicken tikka", "butter chicken", "tandoori chicken",
+    "paneer butter masala", "lamb rogan josh", "chicken biryani", "vegetable biryani",
+    "samosa", "biryani", "naan", "garlic naan", "butter naan",
+    # Italian
+    "pizza", "pasta", "margherita", "pepperoni", "lasagna", "carbonara",
+    # Japanese
+    "sushi", "ramen", "tempura", "teriyaki",
+    # Mexican
+    "tacos", "burrito", "quesadilla", "enchilada",
+    # Thai
+    "pad thai", "curry", "fried rice", "noodles", "tom yum"
+]
+
+# Preference -> keywords that signal it
+PREFERENCE_KEYWORDS = {
+    "spicy": ("spicy", "hot"),
+    "vegetarian": ("vegetarian", "veg"),
+    "vegan": ("vegan",),
+    "healthy": ("healthy",),
+}
+FAVORITE_KEYWORDS = ("favorite", "usual", "regular")
+URGENCY_KEYWORDS = ("hungry", "starving")
+QUICK_KEYWORDS = ("quick", "fast", "asap")
+
+# Assume quick means 20 minutes or less
+QUICK_TIME_MAX = 20
+
+# Python's regex engine only beats one substring check per keyword once the
+# vocabulary is large; below this many keywords the checks are faster
+SCANNER_MIN_KEYWORDS = 100
+
+PRICE_PATTERN = re.compile(r'\$(\d+)')
+UNDER_PRICE_PATTERN = re.compile(r'(?:under|below)\s+\$?(\d+)')
+TIME_PATTERN = re.compile(r'(\d+)\s*(?:min|minute)')
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex alternation shaped like a trie over the given words.
+
+    Shared prefixes are matched once and longer continuations are tried before
+    stopping, so at any position the longest keyword starting there wins.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def render(node: Dict) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class QueryParser:
+    """
+    Keyword scanner compiled from the cuisine list and the fixed vocabularies.
+
+    For large vocabularies, one lookahead pass of a trie-shaped regex finds the
+    longest keyword starting at each position. Keywords contained in a longer
+    match (e.g. "veg" inside "vegetarian") are precomputed, so the pass reports
+    exactly the set of keywords that occur as substrings of the query. Small
+    vocabularies use a precomputed tuple of substring checks instead.
+    """
+
+    def __init__(self, cuisines: List[str], version: Optional[int] = None):
+        self.version = version
+        self.cuisines = list(cuisines)
+        self.preferences = list(PREFERENCE_KEYWORDS)
+        # keyword -> list of (role, rank) it signals; ranks keep the original output order
+        roles: Dict[str, List[Tuple[str, int]]] = {}
+        for rank, cuisine in enumerate(self.cuisines):
+            roles.setdefault(cuisine.lower(), []).append(("cuisine", rank))
+        for rank, dish in enumerate(COMMON_DISHES):
+            roles.setdefault(dish, []).append(("dish", rank))
+        for rank, words in enumerate(PREFERENCE_KEYWORDS.values()):
+            for word in words:
+                roles.setdefault(word, []).append(("preference", rank))
+        for role, words in (("favorite", FAVORITE_KEYWORDS), ("urgency", URGENCY_KEYWORDS), ("quick", QUICK_KEYWORDS)):
+            for word in words:
+                roles.setdefault(word, []).append((role, 0))
+        roles.pop("", None)
+        self._roles = {keyword: tuple(signals) for keyword, signals in roles.items()}
+        self._keywords = tuple(sorted(self._roles))
+        self._scanner = None
+        if len(self._keywords) >= SCANNER_MIN_KEYWORDS:
+            self._scanner = re.compile("(?=(" + _trie_pattern(self._keywords) + "))")
+            self._contained = {
+                keyword: frozenset(other for other in self._keywords if other in keyword)
+                for keyword in self._keywords
+            }
+
+    def keywords_in(self, text: str) -> Set[str]:
+        """All known keywords occurring anywhere in the (lowercased) text"""
+        if self._scanner is None:
+            return {keyword for keyword in self._keywords if keyword in text}
+        found: Set[str] = set()
+        contained = self._contained
+        for match in self._scanner.finditer(text):
+            keyword = match.group(1)
+            if keyword not in found:
+                found |= contained[keyword]
+        return found
+
+    def parse(self, query: str) -> Dict:
+        """Parse a query into ParsedQuery fields (everything except location)"""
+        query_lower = query.lower()
+        found = self.keywords_in(query_lower)
+
+        # Resolve every matched keyword to the signals it carries
+        cuisine_ranks = []
+        preference_ranks = []
+        dish_rank = None
+        use_favorites = urgent = quick = False
+        for keyword in found:
+            for role, rank in self._roles[keyword]:
+                if role == "cuisine":
+                    cuisine_ranks.append(rank)
+                elif role == "dish":
+                    if dish_rank is None or rank < dish_rank:
+                        dish_rank = rank
+                elif role == "preference":
+                    preference_ranks.append(rank)
+                elif role == "favorite":
+                    use_favorites = True
+                elif role == "urgency":
+                    urgent = True
+                else:
+                    quick = True
+
+        # Extract cuisine
+        cuisines_found = [self.cuisines[rank] for rank in sorted(cuisine_ranks)]
+
+        # Extract dish names (common dishes), highest priority first
+        dish = COMMON_DISHES[dish_rank].title() if dish_rank is not None else None
+
+        # Extract price constraint
+        price_max = None
+        price_match = None
+        if "$" in query_lower:
+            price_match = PRICE_PATTERN.search(query_lower)
+        if not price_match and ("under" in query_lower or "below" in query_lower):
+            price_match = UNDER_PRICE_PATTERN.search(query_lower)
+        if price_match:
+            price_max = float(price_match.group(1))
+
+        # Extract time constraint
+        time_max = None
+        time_match = TIME_PATTERN.search(query_lower) if "min" in query_lower else None
+        if time_match:
+            time_max = int(time_match.group(1))
+        elif quick:
+            time_max = QUICK_TIME_MAX
+
+        # Extract preferences
+        preferences = [self.preferences[rank] for rank in sorted(set(preference_ranks))]
+
+        # Detect urgency
+        urgency = "high" if urgent else None
+
+        # Determine intent
+        if use_favorites:
+            intent = "favorites"
+        elif dish or cuisines_found:
+            intent = "search"
+        elif urgency:
+            intent = "urgent"
+        else:
+            intent = "browse"
+
+        return {
+            "intent": intent,
+            "cuisine": cuisines_found if cuisines_found else None,
+            "dish": dish,
+            "price_max": price_max,
+            "time_max": time_max,
+            "preferences": preferences,
+            "use_favorites": use_favorites,
+            "urgency": urgency,
+        }
@@ -0,0 +1,167 @@
+"""
+Structured request logging
+Compact single-line JSON records, formatted and written by a background thread
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+# Set up by configure_logging(): the root queue handler and the handler the writer thread
+# writes with. The writer thread itself is started by the first record in each process.
+_queue_handler: Optional["DeferredQueueHandler"] = None
+_writer: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class JSONLineFormatter(logging.Formatter):
+    """Format a record as one compact JSON object per line (extra={"fields": {...}} is merged in)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueue records without formatting them.
+
+    The stock QueueHandler formats the message in the calling thread (the event
+    loop); here %-style args stay unformatted until the listener thread writes
+    the record. Callers must not mutate objects passed as log args afterwards.
+
+    The writer thread is started with the first record, so a process that
+    configures logging and then forks (gunicorn --preload) starts one writer
+    per worker instead of relying on a thread the fork did not copy.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if _listener is None:
+            _start_listener()
+        super().enqueue(record)
+
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is None and _queue_handler is not None:
+            _listener = QueueListener(_queue_handler.queue, _writer, respect_handler_level=True)
+            _listener.start()
+
+
+def configure_logging(level: Optional[str] = None, stream=None):
+    """
+    Route all logging through a queue to a background writer thread, started by the first record.
+
+    - **level**: root log level (default: LOG_LEVEL env var, else INFO)
+    - **stream**: where the writer thread writes (default: stderr, console only for Vercel)
+    """
+    global _queue_handler, _writer
+    stop_logging()
+
+    _writer = logging.StreamHandler(stream or sys.stderr)
+    _writer.setFormatter(JSONLineFormatter())
+    _queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_queue_handler)
+    root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def _after_fork_in_child():
+    # The writer thread was not copied into the child, and the parent writes the records
+    # that were queued at the fork: start over with an empty queue and no writer thread
+    global _listener, _listener_lock
+    _listener = None
+    _listener_lock = threading.Lock()
+    if _queue_handler is not None:
+        _queue_handler.queue = queue.SimpleQueue()
+
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class AccessLog:
+    """
+    One access record per request, with monotonic request ids and sampling.
+
+    Successful requests are logged with probability sample_rate (LOG_SAMPLE_RATE
+    env var, default 1.0); responses with status >= 400 are always logged.
+    """
+
+    def __init__(self, logger: logging.Logger, sample_rate: Optional[float] = None):
+        self.logger = logger
+        if sample_rate is None:
+            sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        # itertools.count is atomic under the GIL, so ids are unique per process;
+        # the pid prefix keeps them unique across workers (reset in forked workers)
+        self._counter = itertools.count(1)
+        self._prefix = f"{os.getpid():x}-"
+
+    def next_request_id(self) -> str:
+        """Monotonic request id, unique across worker processes on one host"""
+        return self._prefix + str(next(self._counter))
+
+    def should_log(self, status_code: int) -> bool:
+        """Whether to emit the access record for a response"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return False
+        if status_code >= 400 or self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+
+    def log(self, request_id: str, method: str, path: str, status_code: int, started: float,
+            client_host: Optional[str] = None):
+        """Emit the access record (started is a time.perf_counter() value)"""
+        if not self.should_log(status_code):
+            return
+        self.logger.info("request", extra={"fields": {
+            "request_id": request_id,
+            "method": method,
+            "path": path,
+            "status": status_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "client": client_host,
+        }})
@@ -0,0 +1,186 @@
+"""
+Pre-encoded response payloads with ETag / conditional GET support
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional
+
+from collections.abc import Mapping
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: fast_encode_json falls back to the standard encoder
+    orjson = None
+
+
+class CachedPayload(NamedTuple):
+    """Response body encoded once, with its strong ETag"""
+    body: bytes
+    etag: str
+
+
+def encode_json(content: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Encode JSON exactly like FastAPI's default JSONResponse (`default` converts other types, as in json.dumps)"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=default,
+    ).encode("utf-8")
+
+
+def _json_default(value: Any) -> Any:
+    # Catalog records (any Mapping), models and sets: values the API returns that the encoders do not take natively
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def fast_encode_json(content: Any) -> bytes:
+    """
+    Encode JSON with orjson when it is installed (same output for API data),
+    else with encode_json. Either way catalog records (any Mapping) and
+    models are encoded too, since trusted responses skip their validation.
+    """
+    if orjson is None:
+        return encode_json(content, default=_json_default)
+    return orjson.dumps(content, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with fast_encode_json.
+
+    Returned directly from an endpoint it also skips response_model validation
+    and serialization (the route's response_model still documents the schema),
+    so only return data that already matches the model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return fast_encode_json(content)
+
+
+def make_payload(body: bytes) -> CachedPayload:
+    """Wrap encoded bytes with a strong ETag derived from their content"""
+    return CachedPayload(body=body, etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"')
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match covers this ETag (weak comparison, per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_response(request: Request, payload: CachedPayload, cache_control: str,
+                         media_type: str = "application/json") -> Response:
+    """200 with the cached body, or an empty 304 if the client already has this version"""
+    headers = {"ETag": payload.etag, "Cache-Control": cache_control}
+    if etag_matches(request, payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type=media_type, headers=headers)
+
+
+class JSONFileCache:
+    """
+    A JSON file loaded lazily and kept as pre-encoded bytes.
+    The file is re-read only when its mtime or size changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._payload: Optional[CachedPayload] = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def get(self) -> CachedPayload:
+        """Current payload, reloading the file if it changed on disk"""
+        stat = os.stat(self.path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        payload = self._payload
+        if payload is not None and stamp == self._stamp:
+            return payload
+        with self._lock:
+            if self._payload is None or stamp != self._stamp:
+                with open(self.path, "r") as f:
+                    # Re-encode compactly so the bytes match what FastAPI used to send
+                    self._payload = make_payload(encode_json(json.load(f)))
+                self._stamp = stamp
+            return self._payload
+
+
+class VersionedResponseCache:
+    """
+    Pre-encoded payloads keyed by (endpoint, id), for data that only changes
+    with its source version (e.g. the catalog version). Every entry is dropped
+    as soon as version() returns something new; at most max_entries are kept,
+    oldest evicted first.
+    """
+
+    def __init__(self, version: Callable[[], Hashable], max_entries: int = 4096,
+                 encode: Callable[[Any], bytes] = encode_json):
+        self.version = version
+        self.max_entries = max_entries
+        self.encode = encode
+        self._entries: Dict[Hashable, CachedPayload] = {}
+        self._version: Hashable = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Optional[CachedPayload]:
+        """
+        Cached payload for key, else build() encoded and cached.
+        A build() returning None (e.g. not found) is passed through, not cached.
+        """
+        version = self.version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._entries = {}
+                    self._version = version
+        entries = self._entries
+        payload = entries.get(key)
+        if payload is not None:
+            self.hits += 1
+            return payload
+        self.misses += 1
+        content = build()
+        if content is None:
+            return None
+        payload = make_payload(self.encode(content))
+        with self._lock:
+            if entries is self._entries:
+                while len(entries) >= self.max_entries:
+                    del entries[next(iter(entries))]
+                entries[key] = payload
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,115 @@
+"""
+Intelligent search caches
+Parsed queries and search results, reused across near-identical queries until the catalog changes
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Returned by LRUCache.get on a miss (None is a valid cached value)
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded cache that evicts the least recently used entry, optionally
+    expiring entries `ttl` seconds after they were stored. Not thread-safe:
+    meant for use from the event loop.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """The cached value, or MISSING"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires, value = entry
+        if expires and self.clock() >= expires:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        expires = self.clock() + self.ttl if self.ttl else 0.0
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class SearchCache:
+    """
+    Two levels for intelligent search:
+
+    - parsed: raw query string -> parsed query, without the location (LRU).
+      Parsing is pure for a given catalog, so entries never expire on their own.
+    - results: canonical parsed query + location + limit -> result payload
+      (LRU + TTL). Differently worded queries that parse the same share it.
+
+    Both are emptied when the catalog version changes (see sync()).
+    Sizes and TTL default from SEARCH_PARSE_CACHE_SIZE (4096),
+    SEARCH_RESULT_CACHE_SIZE (1024) and SEARCH_RESULT_CACHE_TTL (300 seconds).
+    """
+
+    def __init__(self, parse_entries: Optional[int] = None, result_entries: Optional[int] = None,
+                 result_ttl: Optional[float] = None):
+        if parse_entries is None:
+            parse_entries = int(os.getenv("SEARCH_PARSE_CACHE_SIZE", "4096"))
+        if result_entries is None:
+            result_entries = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "1024"))
+        if result_ttl is None:
+            result_ttl = float(os.getenv("SEARCH_RESULT_CACHE_TTL", "300"))
+        self.parsed = LRUCache(parse_entries)
+        self.results = LRUCache(result_entries, ttl=result_ttl)
+        self.version: Hashable = None
+        self.invalidations = 0
+
+    def sync(self, version: Hashable):
+        """Drop everything cached for an older catalog version"""
+        if version != self.version:
+            if self.version is not None:
+                self.invalidations += 1
+            self.parsed.clear()
+            self.results.clear()
+            self.version = version
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "catalog_version": self.version,
+            "invalidations": self.invalidations,
+            "parsed": self.parsed.stats(),
+            "results": self.results.stats(),
+        }
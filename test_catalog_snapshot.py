@@ -0,0 +1,86 @@
+"""
+Catalog snapshot tests
+Every restaurant, menu and menu item read back from a written snapshot matches what was written
+"""
+
+import json
+
+from catalog_data import MENUS, RESTAURANTS
+from catalog_index import CatalogIndex
+from catalog_snapshot import CatalogSnapshot, SnapshotRestaurant, write_snapshot
+from menu_index import MenuItemStore
+
+# Values that do not fit the typed columns (ints, nulls, unknown keys, odd locations)
+UNUSUAL = [
+    {"id": "odd_001", "name": "Nulls", "cuisine": None, "location": {"city": "Somewhere", "lat": None, "lng": 2},
+     "rating": 4, "price_range": "$", "delivery_time": None, "minimum_order": 0, "delivery_fee": 1.5,
+     "is_open": 1, "image_url": "", "tags": ["late", "night"], "lat": "top-level"},
+    {"id": "odd_002", "name": "Empty location", "location": {}, "rating": 3.5},
+    {"id": "odd_003", "name": "Text location", "location": "Pier 39", "is_open": False},
+    {"id": "odd_004", "name": "Üñíçødé ✓", "cuisine": "Française", "location": {"address": "1 Rue", "floor": 3}},
+]
+
+
+def snapshot_of(tmp_path, restaurants, menus):
+    path = str(tmp_path / "catalog.snap")
+    write_snapshot(path, restaurants, menus)
+    return CatalogSnapshot(path)
+
+
+def as_json(value):
+    # Key order matters: a record must read back exactly as it was written
+    return json.dumps(value, ensure_ascii=False)
+
+
+def test_restaurants_round_trip(tmp_path):
+    snapshot = snapshot_of(tmp_path, RESTAURANTS + UNUSUAL, {})
+    assert len(snapshot) == len(RESTAURANTS) + len(UNUSUAL)
+    for ordinal, restaurant in enumerate(RESTAURANTS + UNUSUAL):
+        record = snapshot.record(ordinal)
+        assert as_json(record.to_dict()) == as_json(restaurant)
+        assert record == restaurant
+        assert snapshot.ordinal(restaurant["id"]) == ordinal
+        assert snapshot.get(restaurant["id"]).to_dict() == restaurant
+    assert snapshot.get("missing") is None
+    assert as_json([r.to_dict() for r in snapshot.restaurants()]) == as_json(RESTAURANTS + UNUSUAL)
+
+
+def test_menus_round_trip(tmp_path):
+    snapshot = snapshot_of(tmp_path, RESTAURANTS, MENUS)
+    assert list(snapshot.menus) == list(MENUS)
+    for restaurant_id, menu in MENUS.items():
+        assert as_json(snapshot.menus[restaurant_id]) == as_json(menu)
+        items = [item for category in menu["categories"] for item in category["items"]]
+        rows = snapshot.menu_items(restaurant_id)
+        assert [snapshot.menu_item(row[-1]) for row in rows] == items
+        assert [row[0] for row in rows] == [item["name"] for item in items]
+    assert snapshot.menus.get("missing") is None
+    assert snapshot.menu_items("missing") is None
+
+
+def test_records_are_read_in_place_and_keep_writes(tmp_path):
+    snapshot = snapshot_of(tmp_path, RESTAURANTS, MENUS)
+    record = snapshot.get("rest_001")
+    assert isinstance(record, SnapshotRestaurant)
+    record.update({"rating": 1.0, "promo": "free delivery"})
+    record["location"]["city"] = "Elsewhere"
+    del record["image_url"]
+    assert record["rating"] == 1.0 and record["promo"] == "free delivery"
+    assert record["location"]["city"] == "Elsewhere"
+    assert "image_url" not in record and list(record)[-1] == "promo"
+    # Writes stay on that view; the file and other views are unchanged
+    assert snapshot.get("rest_001")["rating"] == RESTAURANTS[0]["rating"]
+
+
+def test_indexes_built_from_snapshot_match_dicts(tmp_path):
+    snapshot = snapshot_of(tmp_path, RESTAURANTS, MENUS)
+    from_dicts, from_snapshot = CatalogIndex(RESTAURANTS), CatalogIndex(list(snapshot.restaurants()))
+    assert from_snapshot.postings == from_dicts.postings
+    assert from_snapshot.ordering("delivery") == from_dicts.ordering("delivery")
+
+    store, mapped = MenuItemStore(MENUS), MenuItemStore(snapshot.menus)
+    assert mapped.names == store.names and mapped.prices == store.prices
+    assert mapped.spicy == store.spicy and mapped.vegetarian == store.vegetarian
+    assert all(type(item) is int for item in mapped.items)
+    assert [mapped.item(row) for row in range(len(mapped.items))] == \
+        [store.item(row) for row in range(len(store.items))]
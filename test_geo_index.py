@@ -0,0 +1,86 @@
+"""
+Geo index tests
+KD-tree nearest and radius queries return exactly what a brute-force haversine scan does
+"""
+
+import random
+
+import pytest
+
+from geo_index import GeoIndex, haversine_km
+
+
+def brute_force(points, lat, lng, k=None, radius_km=None, accept=None):
+    scored = []
+    for position, (key, point_lat, point_lng) in enumerate(points):
+        if point_lat is None or point_lng is None or (accept is not None and not accept(key)):
+            continue
+        distance = haversine_km(lat, lng, point_lat, point_lng)
+        if radius_km is None or distance <= radius_km:
+            scored.append((distance, position, key))
+    scored.sort()
+    if k is not None:
+        scored = scored[:k]
+    return [(distance, key) for distance, _, key in scored]
+
+
+def assert_same(found, expected):
+    assert [key for _, key in found] == [key for _, key in expected]
+    assert [distance for distance, _ in found] == pytest.approx([distance for distance, _ in expected], abs=1e-6)
+
+
+def random_points(rng, count):
+    # A few dense clusters (like cities) plus points spread over the whole globe
+    centers = [(37.77, -122.42), (40.71, -74.0), (12.97, 77.59), (-33.87, 151.21)]
+    points = []
+    for key in range(count):
+        if key % 4:
+            lat, lng = rng.choice(centers)
+            points.append((f"p{key}", lat + rng.uniform(-0.5, 0.5), lng + rng.uniform(-0.5, 0.5)))
+        else:
+            points.append((f"p{key}", rng.uniform(-90, 90), rng.uniform(-180, 180)))
+    return points
+
+
+def test_nearest_and_radius_match_brute_force():
+    rng = random.Random(20240101)
+    points = random_points(rng, 500)
+    index = GeoIndex(points)
+    assert len(index) == 500
+    for _ in range(200):
+        lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        if rng.random() < 0.5:
+            lat, lng = points[rng.randrange(len(points))][1:]
+        k = rng.choice([None, 1, 5, 37])
+        radius_km = rng.choice([None, 5.0, 60.0, 2500.0])
+        assert_same(index.nearest(lat, lng, k=k, radius_km=radius_km),
+                    brute_force(points, lat, lng, k=k, radius_km=radius_km))
+
+
+def test_accept_filter_does_not_use_up_k():
+    rng = random.Random(7)
+    points = random_points(rng, 300)
+    index = GeoIndex(points)
+    accept = lambda key: int(key[1:]) % 3 == 0
+    for lat, lng in [(37.7, -122.4), (0.0, 0.0), (12.9, 77.6)]:
+        assert_same(index.nearest(lat, lng, k=10, accept=accept), brute_force(points, lat, lng, k=10, accept=accept))
+
+
+def test_edge_cases():
+    points = [("a", 10.0, 10.0), ("missing", None, 5.0), ("b", 10.0, 10.0), ("c", -10.0, 170.0)]
+    index = GeoIndex(points)
+    assert len(index) == 3
+    # Equal distances keep insertion order; points without coordinates are skipped
+    assert [key for _, key in index.nearest(10.0, 10.0)] == ["a", "b", "c"]
+    assert index.nearest(10.0, 10.0, k=0) == []
+    assert [key for _, key in index.nearest(-10.0, -179.9, k=1)] == ["c"]  # across the antimeridian
+    assert GeoIndex([]).nearest(1.0, 2.0) == []
+
+
+def test_catalog_search_limit_zero_returns_nothing():
+    from mock_data import find_restaurants_near, get_restaurants_by_location
+    assert get_restaurants_by_location(city="San Francisco", limit=0) == []
+    assert get_restaurants_by_location(lat=37.77, lng=-122.41, limit=0) == []
+    assert find_restaurants_near(37.77, -122.41, radius_km=5000, limit=0) == []
+    assert len(get_restaurants_by_location(city="San Francisco", limit=2)) == 2
+    assert len(find_restaurants_near(37.77, -122.41, cuisine="Indian", limit=2)) == 2
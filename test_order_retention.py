@@ -0,0 +1,85 @@
+"""
+Order retention tests
+Delivered orders are archived a TTL after delivery, and dropped only once archived and only when asked to
+"""
+
+from datetime import datetime, timedelta
+
+from order_retention import OrderRetentionSweeper
+from order_store import InMemoryOrderStorage, OrderIndex, OrderRepository
+
+BASE = datetime(2024, 1, 1)
+
+
+def at(hours):
+    return (BASE + timedelta(hours=hours)).isoformat()
+
+
+def make_orders(count):
+    """Every third order pending; the rest delivered 30 hours after they were created"""
+    orders = []
+    for i in range(count):
+        order = {"id": f"ord_{i:04d}", "restaurant_id": f"rest_{i % 3}", "status": "pending",
+                 "created_at": at(i), "total": i * 1.5}
+        if i % 3:
+            order.update(status="delivered", delivered_at=at(i + 30))
+        orders.append(order)
+    return orders
+
+
+def test_delivered_before_is_oldest_delivery_first():
+    orders = make_orders(10)
+    orders[1]["delivered_at"] = at(100)
+    index = OrderIndex(reversed(orders))
+    assert index.delivered_before(at(36)) == ["ord_0002", "ord_0004", "ord_0005"]
+    assert index.delivered_before(at(200))[-1] == "ord_0001"
+    assert index.delivered_before(at(0)) == []
+
+
+def test_delivered_at_is_recorded_when_an_order_is_delivered():
+    storage = InMemoryOrderStorage({})
+    storage.add({"id": "a", "status": "pending", "created_at": at(0)})
+    before = datetime.now().isoformat()
+    delivered_at = storage.update("a", {"status": "delivered"})["delivered_at"]
+    assert before <= delivered_at <= datetime.now().isoformat()
+    # Later writes keep the original delivery time
+    assert storage.update("a", {"status": "delivered", "rating": 5})["delivered_at"] == delivered_at
+    assert storage.index.delivered_before(datetime.now().isoformat()) == ["a"]
+    assert storage.add({"id": "b", "status": "delivered", "created_at": at(0)})["delivered_at"] >= delivered_at
+
+
+def test_archived_orders_are_kept_by_default(monkeypatch):
+    monkeypatch.delenv("ORDER_RETENTION_DROP_AFTER", raising=False)
+    repository = OrderRepository(InMemoryOrderStorage({}))
+    sweeper = OrderRetentionSweeper(repository, ttl=3600)
+    assert sweeper.drop_after is None
+    orders = make_orders(30)
+    for order in orders:
+        repository.add(dict(order))
+    assert sweeper.sweep(now=BASE + timedelta(days=365)) == (20, 0)
+    assert sweeper.sweep(now=BASE + timedelta(days=730)) == (0, 0)
+    assert repository.get_many([order["id"] for order in orders]) == {order["id"]: order for order in orders}
+
+
+def test_orders_age_from_delivery_and_are_dropped_only_once_archived():
+    orders = make_orders(60)
+    # Created long ago but delivered just now: too fresh to archive or drop
+    orders[1]["delivered_at"] = at(89.5)
+    repository = OrderRepository(InMemoryOrderStorage({}))
+    for order in orders:
+        repository.add(dict(order))
+    sweeper = OrderRetentionSweeper(repository, ttl=3600, drop_after=86400, interval=60)
+
+    # Delivered more than an hour ago: archived, still readable; nothing was archived before, so nothing is dropped
+    assert sweeper.sweep(now=BASE + timedelta(hours=90)) == (38, 0)
+    assert repository.memory_stats()["archived_orders"] == 38
+    assert repository.get_many([order["id"] for order in orders]) == {order["id"]: order for order in orders}
+
+    # Archived orders delivered more than a day ago are dropped on the next pass
+    archived, dropped = sweeper.sweep(now=BASE + timedelta(hours=91))
+    assert (archived, dropped) == (2, 23)
+    for order in orders:
+        gone = order["status"] == "delivered" and order["delivered_at"] < at(67)
+        assert (repository.get(order["id"]) is None) == gone
+    assert repository.get("ord_0001") == orders[1]
+    assert sum(repository.status_counts().values()) == len(repository) == 60 - dropped
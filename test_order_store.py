@@ -0,0 +1,137 @@
+"""
+Order storage tests
+Orders written to SQLite are all there, unchanged, after the database is closed and reopened,
+and in-memory orders cannot be changed except through the storage
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from order_store import InMemoryOrderStorage, OrderRepository, SQLiteOrderStorage, create_order_storage
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def order(n, **fields):
+    return dict({"id": f"ord_{n:04d}", "restaurant_id": f"rest_{n % 3:03d}", "status": "pending",
+                 "created_at": f"2024-01-01T00:{n // 60:02d}:{n % 60:02d}", "items": [{"name": "Taco", "quantity": n}],
+                 "total": n * 2.5}, **fields)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "orders.db")
+
+
+def test_orders_persist_after_reopening(db_path):
+    storage = SQLiteOrderStorage(db_path)
+    orders = {}
+    for n in range(50):
+        orders[f"ord_{n:04d}"] = storage.add(order(n))
+    for n in range(0, 50, 5):
+        orders[f"ord_{n:04d}"] = storage.update(f"ord_{n:04d}", {"status": "delivered", "rating": 4})
+    assert storage.update("missing", {"status": "delivered"}) is None
+    storage.close()
+
+    reopened = SQLiteOrderStorage(db_path)
+    try:
+        assert reopened.count() == 50
+        assert reopened.get_many(list(orders)) == orders
+        assert reopened.get("ord_0005") == order(5, status="delivered", rating=4)
+        assert reopened.status_counts() == {"pending": 40, "delivered": 10}
+        assert sorted(reopened.undelivered_ids()) == sorted(i for i, o in orders.items() if o["status"] != "delivered")
+        assert reopened.query(status="delivered", restaurant_id="rest_000") == \
+            [orders[f"ord_{n:04d}"] for n in (0, 15, 30, 45)]
+        with pytest.raises(KeyError):
+            reopened.add(order(1))
+    finally:
+        reopened.close()
+
+
+def test_batched_and_concurrent_writes_persist(db_path):
+    storage = create_order_storage("sqlite", db_path)
+    results = storage.apply_batch([("add", order(1)), ("add", order(1)), ("update", "ord_0001", {"status": "confirmed"}),
+                                   ("update", "missing", {})])
+    assert results[0] == order(1) and isinstance(results[1], KeyError)
+    assert results[2]["status"] == "confirmed" and results[3] is None
+
+    repository = OrderRepository(storage)
+    threads = [threading.Thread(target=lambda start=start: [repository.add(order(n)) for n in range(start, start + 25)])
+               for start in range(100, 200, 25)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    repository.close()
+
+    reopened = SQLiteOrderStorage(db_path)
+    try:
+        assert reopened.count() == 101
+        assert reopened.get("ord_0001")["status"] == "confirmed"
+        assert [o["id"] for o in reopened.query(since="2024-01-01T00:01:40")] == [f"ord_{n:04d}" for n in range(100, 200)]
+    finally:
+        reopened.close()
+
+
+# Runs the app on SQLite without write-behind in a fresh interpreter (ORDER_STORAGE is read at
+# import), records the storage calls made on the event loop thread, and prints the tracked status
+ORDER_REQUESTS = r"""
+import asyncio, json, logging
+logging.disable(logging.CRITICAL)
+from fastapi.testclient import TestClient
+import main, mock_data
+
+on_loop = []
+def recording(method):
+    def call(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(method.__name__)
+        except RuntimeError:
+            pass
+        return method(*args, **kwargs)
+    return call
+for name in ("get", "add", "update", "get_many", "query", "status_counts"):
+    setattr(mock_data.ORDER_STORAGE, name, recording(getattr(mock_data.ORDER_STORAGE, name)))
+
+address = {"address": "1 Main St", "city": "San Francisco", "state": "CA", "zip": "94103"}
+with TestClient(main.app) as client:
+    order = client.post("/api/v1/orders/create", json={
+        "restaurant_id": "rest_001", "items": [{"item_id": "item_001", "name": "Naan", "price": 4.5, "quantity": 2}],
+        "delivery_address": address}).json()
+    order_id = order["id"]
+    client.post(f"/api/v1/orders/{order_id}/payment", json={"payment_method": {"type": "card"}})
+    client.patch(f"/api/v1/orders/{order_id}/status", params={"status": "out_for_delivery"})
+    client.post("/api/v1/orders/batch", json={"order_ids": [order_id]})
+    client.get("/api/v1/orders", params={"status": "out_for_delivery"})
+    client.get("/api/v1/orders/stats")
+    tracked = client.get(f"/api/v1/orders/{order_id}/track").json()
+    print(json.dumps({"on_loop": on_loop, "status": tracked["status"]}))
+"""
+
+
+def test_sqlite_order_requests_run_off_the_event_loop(db_path):
+    env = dict(os.environ, ORDER_STORAGE="sqlite", ORDER_DB_PATH=db_path, ORDER_WRITE_BEHIND="0")
+    output = subprocess.run([sys.executable, "-c", ORDER_REQUESTS], env=env, cwd=HERE,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output)
+    assert result["status"] == "out_for_delivery"
+    assert result["on_loop"] == []
+
+
+def test_in_memory_orders_are_copied_in_and_out():
+    storage = InMemoryOrderStorage({})
+    placed = order(1, delivery_address={"address": "1 Main St"})
+    returned = storage.add(placed)
+    placed["items"][0]["quantity"] = 99
+    returned["delivery_address"]["address"] = "elsewhere"
+    storage.get("ord_0001")["items"].append({"name": "Extra"})
+    method = {"type": "card"}
+    storage.update("ord_0001", {"payment_method": method})["payment_method"]["type"] = "cash"
+    method["type"] = "voucher"
+    assert storage.get("ord_0001") == order(1, delivery_address={"address": "1 Main St"}, payment_method={"type": "card"})
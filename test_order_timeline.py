@@ -0,0 +1,111 @@
+"""
+Order timeline and status scheduler tests
+The timeline only ever moves an order forward, and a status set by hand is never undone
+"""
+
+import asyncio
+import threading
+import time
+
+from order_scheduler import OrderStatusScheduler
+from order_store import OrderRepository
+from order_timeline import STAGES, build_schedule, next_stage_at, project, status_changes
+from timer_wheel import TimerWheel
+
+
+def order_at_stage(stage, status=None, now=None, stage_seconds=120.0):
+    """An order halfway through `stage`, whose stages last stage_seconds each"""
+    now = time.time() if now is None else now
+    start = now - (stage + 0.5) * stage_seconds
+    schedule = [start + index * stage_seconds for index in range(len(STAGES))]
+    return {"id": "ord_test", "created_at": "2024-01-01T00:00:00", "status": status or STAGES[stage].status,
+            "status_stage": stage, "status_schedule": schedule}
+
+
+def test_projection_follows_the_schedule():
+    now = time.time()
+    order = {"status": "pending", "status_schedule": build_schedule(now - 5 * 60)}
+    state = project(order, now)
+    assert state.status == "preparing" and state.elapsed_minutes == 5
+    assert status_changes(order, state) == {"status": "preparing", "status_stage": state.stage}
+    assert next_stage_at(order, state) == order["status_schedule"][state.stage + 1]
+
+
+def test_stored_status_ahead_of_the_schedule_is_kept():
+    now = time.time()
+    order = order_at_stage(1, status="out_for_delivery", now=now)
+    state = project(order, now)
+    assert state.status == "out_for_delivery"
+    assert status_changes(order, state) is None
+    assert next_stage_at(order, state) == order["status_schedule"][state.stage + 1]
+
+    order["status"] = "delivered"
+    state = project(order, now)
+    assert state.status == "delivered" and state.estimated_delivery == "Delivered"
+    assert status_changes(order, state) is None and next_stage_at(order, state) is None
+
+
+def test_cancelled_orders_stay_cancelled():
+    order = order_at_stage(2, status="cancelled")
+    state = project(order)
+    assert state.status == "cancelled" and state.eta_minutes == 0
+    assert status_changes(order, state) is None and next_stage_at(order, state) is None
+
+
+def run_scheduler(scenario, offload=False):
+    async def main():
+        repository = OrderRepository()
+        scheduler = OrderStatusScheduler(repository, TimerWheel(tick=0.01), offload=offload)
+        repository.add_listener(scheduler.repository_listener)
+        scheduler.start()
+        try:
+            await scenario(repository, scheduler)
+        finally:
+            scheduler.stop()
+    asyncio.run(main())
+
+
+def test_scheduler_advances_orders():
+    async def scenario(repository, scheduler):
+        repository.add(order_at_stage(0, stage_seconds=0.1))
+        assert len(scheduler) == 1
+        await asyncio.sleep(0.12)
+        assert repository.get("ord_test")["status"] == "confirmed"
+        assert scheduler.transitions == 1
+    run_scheduler(scenario)
+
+
+def test_offloaded_scheduler_reads_and_writes_in_worker_threads():
+    async def scenario(repository, scheduler):
+        loop_thread = threading.get_ident()
+        writers = []
+        repository.add_listener(lambda order_id, changes: writers.append(threading.get_ident()))
+        repository.add(order_at_stage(0, stage_seconds=0.1))
+        await asyncio.sleep(0.15)
+        assert repository.get("ord_test")["status"] == "confirmed"
+        assert len(scheduler) == 1 and scheduler.transitions == 1
+        assert writers[0] == loop_thread and loop_thread not in writers[1:]
+    run_scheduler(scenario, offload=True)
+
+
+def test_scheduler_never_undoes_a_manual_status():
+    async def scenario(repository, scheduler):
+        repository.add(order_at_stage(0, stage_seconds=0.1))
+        repository.update("ord_test", {"status": "delivered"})
+        assert len(scheduler) == 0
+        await asyncio.sleep(0.3)
+        assert repository.get("ord_test")["status"] == "delivered"
+        assert scheduler.transitions == 0
+    run_scheduler(scenario)
+
+
+def test_manual_status_replaces_the_pending_transition():
+    async def scenario(repository, scheduler):
+        order = repository.add(order_at_stage(0))
+        first = scheduler._timers["ord_test"]
+        assert first.when == order["status_schedule"][1]
+        repository.update("ord_test", {"status": "ready_for_pickup"})
+        assert first.cancelled
+        assert scheduler._timers["ord_test"].when == order["status_schedule"][4]
+        assert repository.get("ord_test")["status"] == "ready_for_pickup"
+    run_scheduler(scenario)
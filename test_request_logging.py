@@ -0,0 +1,71 @@
+"""
+Request logging tests
+Queued JSON logging and access log request ids keep working in forked workers
+"""
+
+import json
+import logging
+import os
+
+import pytest
+
+import request_logging
+from request_logging import AccessLog, configure_logging, stop_logging
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    path = tmp_path / "log.jsonl"
+    with open(path, "a", buffering=1) as stream:
+        configure_logging("INFO", stream)
+        yield path
+        stop_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_writer_thread_starts_with_the_first_record(log_file):
+    assert request_logging._listener is None
+    logging.getLogger("test").info("hello %s", "world", extra={"fields": {"n": 1}})
+    assert request_logging._listener is not None
+    stop_logging()
+    assert read_records(log_file)[-1] | {"ts": None} == \
+        {"ts": None, "level": "INFO", "logger": "test", "msg": "hello world", "n": 1}
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_worker_logs_and_gets_its_own_request_ids(log_file):
+    access_log = AccessLog(logging.getLogger("access"))
+    logging.getLogger("test").info("parent")
+    parent_id = access_log.next_request_id()
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            os.close(read_end)
+            logging.getLogger("test").info("child")
+            os.write(write_end, access_log.next_request_id().encode())
+            stop_logging()
+            code = 0
+        finally:
+            os._exit(code)
+    os.close(write_end)
+    child_id = os.read(read_end, 100).decode()
+    os.close(read_end)
+    assert os.waitpid(pid, 0)[1] == 0
+    stop_logging()
+
+    assert [record["msg"] for record in read_records(log_file)] == ["parent", "child"]
+    assert parent_id == f"{os.getpid():x}-1"
+    assert child_id == f"{pid:x}-1"
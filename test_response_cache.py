@@ -0,0 +1,58 @@
+"""
+Fast JSON encoding tests
+fast_encode_json matches encode_json with or without orjson, for plain dicts and compact catalog records
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import response_cache
+from catalog_data import RESTAURANTS
+from catalog_records import compact_restaurant
+from response_cache import encode_json, fast_encode_json
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_fast_encode_json_accepts_records_without_orjson(monkeypatch):
+    monkeypatch.setattr(response_cache, "orjson", None)
+    records = [compact_restaurant(r) for r in RESTAURANTS]
+    assert fast_encode_json(records) == encode_json(RESTAURANTS)
+    assert fast_encode_json({"tags": {"late"}}) == b'{"tags":["late"]}'
+
+
+def test_fast_encode_json_matches_encode_json():
+    records = [compact_restaurant(r) for r in RESTAURANTS]
+    assert fast_encode_json(records) == encode_json(RESTAURANTS)
+
+
+# Runs the app in a fresh interpreter (FAST_JSON and CATALOG_COMPACT are read at import),
+# optionally with orjson hidden, and prints the search response
+SEARCH = r"""
+import sys
+if sys.argv[1] == "hide":
+    sys.modules["orjson"] = None
+import logging
+logging.disable(logging.CRITICAL)
+from fastapi.testclient import TestClient
+import main
+response = TestClient(main.app).get("/api/v1/restaurants/search", params={"city": "San Francisco"})
+print(response.status_code)
+print(response.text)
+"""
+
+
+def search(env, orjson):
+    env = dict(os.environ, **env)
+    output = subprocess.run([sys.executable, "-c", SEARCH, orjson], env=env, cwd=HERE,
+                            capture_output=True, text=True, check=True).stdout
+    status, body = output.split("\n", 1)
+    return int(status), json.loads(body)
+
+
+def test_fast_json_with_compact_records_without_orjson():
+    expected = search({"FAST_JSON": "0", "CATALOG_COMPACT": "0"}, "keep")
+    assert search({"FAST_JSON": "1", "CATALOG_COMPACT": "1"}, "hide") == expected
+    assert search({"FAST_JSON": "1", "CATALOG_COMPACT": "1"}, "keep") == expected
@@ -0,0 +1,106 @@
+"""
+Timer wheel tests
+Timers placed on any level cascade down and fire on their deadline tick, never early
+"""
+
+import asyncio
+import random
+
+from timer_wheel import TimerWheel
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def on_fake_clock(scenario):
+    # call_at needs a running loop, but the wheel is driven by hand with advance()
+    async def main():
+        scenario()
+    asyncio.run(main())
+
+
+def levels_of(wheel):
+    return [sum(len(bucket) for bucket in level) for level in wheel._levels]
+
+
+def test_timers_cascade_down_and_fire_on_their_tick():
+    def scenario():
+        clock = Clock()
+        wheel = TimerWheel(tick=1.0, slots=4, levels=3, clock=clock)
+        fired = []
+        for when in (2, 6, 21, 40):
+            wheel.call_at(when, lambda when=when: fired.append((when, clock.now)))
+        # Ranges: level 0 < 4 ticks, level 1 < 16, level 2 < 64
+        assert levels_of(wheel) == [1, 1, 2]
+        for now in range(45):
+            clock.now = now
+            wheel.advance(now)
+        assert fired == [(2, 2), (6, 6), (21, 21), (40, 40)]
+        assert len(wheel) == 0 and levels_of(wheel) == [0, 0, 0]
+    on_fake_clock(scenario)
+
+
+def test_timers_beyond_the_top_level_fire_on_time():
+    def scenario():
+        clock = Clock(3.0)
+        wheel = TimerWheel(tick=0.5, slots=4, levels=2, clock=clock)
+        fired = []
+        wheel.call_at(3.0 + 100.25, lambda: fired.append(clock.now))
+        while clock.now < 110:
+            clock.now += 0.5
+            wheel.advance(clock.now)
+        assert fired == [103.5]
+    on_fake_clock(scenario)
+
+
+def test_cancelled_timers_never_fire_on_any_level():
+    def scenario():
+        clock = Clock()
+        wheel = TimerWheel(tick=1.0, slots=4, levels=3, clock=clock)
+        fired = []
+        handles = [wheel.call_at(when, lambda when=when: fired.append(when)) for when in (1, 5, 30, 500)]
+        handles[1].cancel()
+        handles[3].cancel()
+        wheel.advance(600)
+        assert fired == [1, 30] and len(wheel) == 0
+    on_fake_clock(scenario)
+
+
+def test_random_timers_fire_within_a_tick_of_their_deadline():
+    def scenario():
+        rng = random.Random(3)
+        for slots, levels in ((2, 1), (4, 2), (8, 3)):
+            clock = Clock(rng.uniform(0, 1000))
+            wheel = TimerWheel(tick=1.0, slots=slots, levels=levels, clock=clock)
+            deadlines, handles, fired = {}, {}, {}
+            for n in range(300):
+                deadlines[n] = clock.now + rng.uniform(0, 2 * slots ** (levels + 1))
+                handles[n] = wheel.call_at(deadlines[n], lambda n=n: fired.setdefault(n, clock.now))
+            cancelled = set(rng.sample(range(300), 30))
+            for n in cancelled:
+                handles[n].cancel()
+            end = max(deadlines.values()) + 2
+            while clock.now < end:
+                clock.now += rng.uniform(0.1, 2.0)
+                wheel.advance(clock.now)
+            assert set(fired) == set(deadlines) - cancelled
+            for n, when in fired.items():
+                # Due by the tick after the deadline; advance() may run up to a step late
+                assert deadlines[n] <= when < deadlines[n] + 3.0
+            assert len(wheel) == 0
+    on_fake_clock(scenario)
+
+
+def test_running_wheel_fires_on_the_loop():
+    async def main():
+        wheel = TimerWheel(tick=0.01)
+        done = asyncio.Event()
+        wheel.call_later(0.03, done.set)
+        await asyncio.wait_for(done.wait(), 1)
+        assert len(wheel) == 0
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+"""
+Write-behind tests
+Buffered order writes are coalesced per order, flushed in batches and kept for retry when a flush fails
+"""
+
+import asyncio
+import logging
+import threading
+
+from order_store import InMemoryOrderStorage
+from write_behind import WriteBehindOrderStorage
+
+
+class RecordingStorage(InMemoryOrderStorage):
+    """In-memory storage that records every batch and can fail (or hold) the next flush"""
+
+    def __init__(self):
+        super().__init__({})
+        self.batches = []
+        self.calls = 0
+        self.fail = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def apply_batch(self, writes):
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(5)
+        if self.fail:
+            self.fail -= 1
+            raise OSError("disk full")
+        self.batches.append(writes)
+        return super().apply_batch(writes)
+
+
+def order(order_id, **fields):
+    return dict({"id": order_id, "restaurant_id": "rest_001", "status": "pending",
+                 "created_at": "2024-01-01T00:00:00"}, **fields)
+
+
+def run(scenario, **options):
+    async def main():
+        storage = RecordingStorage()
+        buffered = WriteBehindOrderStorage(storage, **dict({"flush_interval": 60}, **options))
+        buffered.start()
+        try:
+            await scenario(buffered, storage)
+        finally:
+            await buffered.stop()
+    asyncio.run(main())
+
+
+def test_writes_to_one_order_are_coalesced():
+    async def scenario(buffered, storage):
+        buffered.add(order("a"))
+        buffered.update("a", {"status": "confirmed"})
+        buffered.update("a", {"status": "preparing", "rating": 5})
+        assert buffered.get("a")["status"] == "preparing" and storage.get("a") is None
+        await buffered.flush()
+        assert storage.batches == [[("add", order("a", status="preparing", rating=5))]]
+
+        buffered.update("a", {"status": "ready_for_pickup"})
+        buffered.update("a", {"status": "delivered"})
+        await buffered.flush()
+        assert storage.batches[1] == [("update", "a", {"status": "delivered"})]
+        assert storage.get("a")["status"] == "delivered" and buffered.flushes == 2
+    run(scenario)
+
+
+def test_flushes_when_the_batch_is_full_or_the_interval_passes():
+    async def scenario(buffered, storage):
+        for n in range(4):
+            buffered.add(order(f"o{n}"))
+        await asyncio.sleep(0.05)
+        assert [len(batch) for batch in storage.batches] == [4]
+
+        buffered.add(order("late"))
+        await asyncio.sleep(0.05)
+        assert storage.get("late") is None
+        await asyncio.sleep(0.3)
+        assert [len(batch) for batch in storage.batches] == [4, 1]
+    run(scenario, batch_size=4, flush_interval=0.2)
+
+
+def test_stop_flushes_everything_buffered():
+    async def main():
+        storage = RecordingStorage()
+        buffered = WriteBehindOrderStorage(storage, flush_interval=60)
+        buffered.start()
+        buffered.add(order("a"))
+        await buffered.stop()
+        assert storage.get("a") == order("a")
+        # Stopped: writes go straight through
+        buffered.update("a", {"status": "confirmed"})
+        assert storage.get("a")["status"] == "confirmed"
+    asyncio.run(main())
+
+
+def test_failed_flush_is_requeued_under_newer_writes(caplog):
+    async def scenario(buffered, storage):
+        buffered.add(order("a"))
+        buffered.add(order("b"))
+        storage.fail, storage.release = 1, threading.Event()
+        flush = asyncio.ensure_future(buffered.flush())
+        await asyncio.get_running_loop().run_in_executor(None, storage.entered.wait, 5)
+        # Written while the failing flush is in flight
+        buffered.update("a", {"status": "confirmed"})
+        buffered.add(order("c"))
+        storage.release.set()
+        with caplog.at_level(logging.ERROR, logger="write_behind"):
+            await flush
+        assert "2 orders kept" in caplog.text
+        assert storage.batches == [] and storage.count() == 0
+        assert buffered.get("a")["status"] == "confirmed" and buffered.count() == 3
+
+        await buffered.flush()
+        assert storage.batches == [[("add", order("a", status="confirmed")), ("add", order("b")),
+                                    ("add", order("c"))]]
+        assert buffered.memory_stats()["buffered_orders"] == 0
+    run(scenario)
+
+
+def test_failing_flushes_back_off_and_mark_the_buffer_unhealthy(caplog):
+    async def scenario(buffered, storage):
+        storage.fail = 1000
+        buffered.add(order("a"))
+        with caplog.at_level(logging.ERROR, logger="write_behind"):
+            await asyncio.sleep(0.4)
+        # Retries wait 0.02, 0.04, then 0.08s each instead of every flush_interval
+        assert 3 <= storage.calls <= 9
+        assert not buffered.healthy and buffered.memory_stats()["failed_flushes"] == storage.calls
+        assert len(caplog.records) == 2
+        assert buffered.get("a") == order("a")
+
+        storage.fail = 0
+        await asyncio.sleep(0.15)
+        assert buffered.healthy and buffered.memory_stats()["failed_flushes"] == 0
+        assert storage.get("a") == order("a")
+    run(scenario, flush_interval=0.01, max_retry_delay=0.08, max_failures=3)
+
+
+def test_updates_from_worker_threads_survive_concurrent_flushes():
+    async def scenario(buffered, storage):
+        buffered.add(order("a"))
+
+        def writer(thread):
+            for n in range(200):
+                updated = buffered.update("a", {f"t{thread}": n})
+                assert updated[f"t{thread}"] == n
+
+        loop = asyncio.get_running_loop()
+        writers = [loop.run_in_executor(None, writer, thread) for thread in range(4)]
+        while not all(task.done() for task in writers):
+            await buffered.flush()
+            await asyncio.sleep(0)
+        await asyncio.gather(*writers)
+        await buffered.flush()
+        assert storage.get("a") == order("a", t0=199, t1=199, t2=199, t3=199)
+    run(scenario)
@@ -0,0 +1,144 @@
+"""
+Timer wheel
+One asyncio task drives every timer, however many streams and orders are waiting
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TimerHandle:
+    """A scheduled callback; cancel() stops it from firing"""
+    __slots__ = ("when", "tick", "callback", "cancelled")
+
+    def __init__(self, when: float, tick: int, callback: Callable[[], None]):
+        self.when = when
+        self.tick = tick
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Hierarchical hashed timing wheel on the running event loop.
+
+    Level 0 has `slots` buckets of one tick each; every higher level has
+    `slots` buckets each spanning a whole lap of the level below. A timer
+    goes into the lowest level whose range covers its deadline; when the
+    wheel reaches the start of a higher-level bucket, that bucket's timers
+    cascade down a level. Each tick therefore touches one level-0 bucket
+    (plus an occasional cascade), so scheduling, cancelling and ticking stay
+    O(1) however many timers are pending and however far out they are.
+
+    A single task sleeps one tick at a time while any timer is pending,
+    instead of one asyncio timer per waiter. Timers fire up to one tick late,
+    never early. Deadlines are wall-clock epoch seconds (time.time()),
+    matching order timelines.
+    """
+
+    def __init__(self, tick: float = 0.5, slots: int = 256, levels: int = 4,
+                 clock: Callable[[], float] = time.time):
+        self.tick = tick
+        self.slots = slots
+        self.clock = clock
+        self._levels: List[List[List[TimerHandle]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._count = 0
+        # Next tick to process; None while the wheel is idle
+        self._current: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return self._count
+
+    def call_at(self, when: float, callback: Callable[[], None]) -> TimerHandle:
+        """Run callback on the loop once the clock reaches `when`"""
+        if self._current is None:
+            self._current = int(self.clock() // self.tick)
+        # First tick at or after `when`, but never one the wheel has already passed
+        handle = TimerHandle(when, max(int(-(-when // self.tick)), self._current), callback)
+        self._place(handle)
+        self._count += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return handle
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        """Run callback on the loop after `delay` seconds"""
+        return self.call_at(self.clock() + delay, callback)
+
+    def _place(self, handle: TimerHandle):
+        delta = handle.tick - self._current
+        span = 1
+        for level in self._levels[:-1]:
+            if delta < span * self.slots:
+                level[(handle.tick // span) % self.slots].append(handle)
+                return
+            span *= self.slots
+        # Top level; anything beyond its range is re-placed when its bucket cascades
+        top = self._levels[-1]
+        if delta < span * self.slots:
+            top[(handle.tick // span) % self.slots].append(handle)
+        else:
+            top[(self._current // span - 1) % self.slots].append(handle)
+
+    async def _run(self):
+        while self._count:
+            self.advance(self.clock())
+            await asyncio.sleep(max(0.0, self._current * self.tick - self.clock()))
+        self._current = None
+
+    def advance(self, now: float):
+        """Fire every timer due by `now`, one tick at a time"""
+        now_tick = int(now // self.tick)
+        while self._current <= now_tick:
+            if not self._count:
+                self._current = now_tick + 1
+                return
+            self._cascade(self._current)
+            self._fire(self._current)
+            self._current += 1
+
+    def _cascade(self, tick: int):
+        # Highest level first, so timers can fall through several levels in one tick
+        for depth in range(len(self._levels) - 1, 0, -1):
+            span = self.slots ** depth
+            if tick % span:
+                continue
+            index = (tick // span) % self.slots
+            bucket = self._levels[depth][index]
+            if not bucket:
+                continue
+            self._levels[depth][index] = []
+            for handle in bucket:
+                if handle.cancelled:
+                    self._count -= 1
+                else:
+                    self._place(handle)
+
+    def _fire(self, tick: int):
+        level = self._levels[0]
+        index = tick % self.slots
+        bucket = level[index]
+        if not bucket:
+            return
+        level[index] = []
+        for handle in bucket:
+            if handle.cancelled:
+                self._count -= 1
+                continue
+            if handle.tick > tick:
+                # Beyond the top level's range when scheduled; not due yet
+                self._place(handle)
+                continue
+            self._count -= 1
+            try:
+                handle.callback()
+            except Exception:
+                logger.exception("Timer callback failed")
@@ -0,0 +1,325 @@
+"""
+Write-behind batching for order mutations
+Writes are acknowledged from memory and flushed to storage in coalesced batches
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from order_store import OrderStorage, order_matches
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    """Not-yet-flushed state of one order: a whole new order, or changes to a stored one"""
+    __slots__ = ("order", "changes")
+
+    def __init__(self, order: Optional[Dict] = None):
+        self.order = order
+        self.changes: Dict = {}
+
+    def write(self, order_id: str) -> Tuple:
+        if self.order is not None:
+            return ("add", self.order)
+        return ("update", order_id, self.changes)
+
+
+class WriteBehindOrderStorage(OrderStorage):
+    """
+    OrderStorage wrapper that buffers writes and flushes them in batches.
+
+    - Mutations are coalesced per order id: a create followed by any number of
+      updates is flushed as one insert, and repeated updates as one update.
+    - A background asyncio task flushes when batch_size orders are pending or
+      flush_interval seconds after the first pending write, whichever is first;
+      the backend commits each flush together (one transaction for SQLite).
+    - At most max_pending orders are buffered; callers await
+      wait_for_capacity() before writing, which blocks while the buffer is full.
+    - Reads see buffered writes layered over the stored order.
+    - Until start() is called (or after stop()), writes go straight through.
+    - A failed flush is kept and retried after an exponential backoff (capped
+      at max_retry_delay). After max_failures failures in a row `healthy`
+      turns False and memory_stats() reports them, until a flush succeeds.
+
+    A write acknowledged from the buffer is lost if the process dies before the
+    next flush; stop() flushes everything on a clean shutdown.
+    """
+
+    def __init__(self, storage: OrderStorage, batch_size: int = 128, flush_interval: float = 0.05,
+                 max_pending: int = 4096, max_retry_delay: float = 30.0, max_failures: int = 5):
+        self.storage = storage
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retry_delay = max_retry_delay
+        self.max_failures = max_failures
+        self._lock = threading.Lock()
+        self._pending: Dict[str, _Pending] = {}
+        self._inflight: Dict[str, _Pending] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.flushes = 0
+        self.flushed_writes = 0
+        self.failures = 0
+
+    @property
+    def healthy(self) -> bool:
+        """False once max_failures flushes in a row have failed"""
+        return self.failures < self.max_failures
+
+    def retry_delay(self) -> float:
+        """Seconds to wait before retrying after the current run of failed flushes"""
+        if not self.failures:
+            return 0.0
+        return min(self.flush_interval * 2 ** self.failures, self.max_retry_delay)
+
+    # Lifecycle
+
+    def start(self):
+        """Start the flusher on the running event loop"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stopping = False
+        self._has_pending = asyncio.Event()
+        self._full = asyncio.Event()
+        self._stop_requested = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything still buffered and stop the flusher"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._stop_requested.set()
+        self._has_pending.set()
+        self._full.set()
+        await self._task
+        # Retry a failed final flush a couple of times before giving up
+        for _ in range(3):
+            if not self._pending:
+                break
+            await self.flush()
+        if self._pending:
+            logger.error("Order write-behind stopped with %d unflushed orders", len(self._pending))
+        self._task = None
+        self._loop = None
+
+    async def wait_for_capacity(self):
+        """Backpressure: wait until the buffer has room for another order"""
+        if self._task is None or len(self._pending) < self.max_pending:
+            return
+        async with self._space:
+            await self._space.wait_for(lambda: len(self._pending) < self.max_pending or self._task is None)
+
+    # OrderStorage
+
+    def add(self, order: Dict) -> Dict:
+        if self._task is None:
+            return self.storage.add(order)
+        order = dict(order)
+        with self._lock:
+            if order["id"] in self._pending or order["id"] in self._inflight:
+                raise KeyError(f"Order {order['id']} already exists")
+            self._pending[order["id"]] = _Pending(order)
+        self._signal()
+        return dict(order)
+
+    def _layers(self, order_id: str) -> List[_Pending]:
+        with self._lock:
+            return [layer[order_id] for layer in (self._inflight, self._pending) if order_id in layer]
+
+    @staticmethod
+    def _overlay(stored: Optional[Dict], layers: List[_Pending]) -> Optional[Dict]:
+        # Buffered writes on top of the stored order, oldest first
+        order = stored
+        for entry in layers:
+            if entry.order is not None:
+                order = dict(entry.order)
+            elif order is not None:
+                order = dict(order, **entry.changes)
+        return order
+
+    def _read(self, order_id: str, layers: List[_Pending]) -> Optional[Dict]:
+        stored = None
+        if not any(entry.order is not None for entry in layers):
+            stored = self.storage.get(order_id)
+        return self._overlay(stored, layers)
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        return self._read(order_id, self._layers(order_id))
+
+    def _buffered_ids(self) -> List[str]:
+        with self._lock:
+            return list(dict.fromkeys(list(self._inflight) + list(self._pending)))
+
+    def get_many(self, order_ids: List[str]) -> Dict[str, Dict]:
+        stored = self.storage.get_many(order_ids)
+        orders = {}
+        for order_id in order_ids:
+            order = self._overlay(stored.get(order_id), self._layers(order_id))
+            if order is not None:
+                orders[order_id] = order
+        return orders
+
+    def query(self, status: Optional[str] = None, restaurant_id: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        filters = {"status": status, "restaurant_id": restaurant_id, "since": since, "until": until}
+        buffered = set(self._buffered_ids())
+        # Buffered writes can drop at most len(buffered) stored matches, so over-fetch by that much
+        stored = self.storage.query(limit=None if limit is None else limit + len(buffered), **filters)
+        results = {order["id"]: order for order in stored if order["id"] not in buffered}
+        for order_id, order in self.get_many(list(buffered)).items():
+            if order_matches(order, **filters):
+                results[order_id] = order
+        ordered = sorted(results.values(), key=lambda order: (order.get("created_at") or "", order["id"]))
+        return ordered if limit is None else ordered[:limit]
+
+    def update(self, order_id: str, changes: Dict) -> Optional[Dict]:
+        if self._task is None:
+            return self.storage.update(order_id, changes)
+        # One lock over the read and the merge: no concurrent update or flush swap
+        # can land in between, so the change applies to the order as read
+        with self._lock:
+            order = self._read(order_id, [layer[order_id] for layer in (self._inflight, self._pending)
+                                          if order_id in layer])
+            if order is None:
+                return None
+            entry = self._pending.get(order_id)
+            if entry is None:
+                entry = self._pending[order_id] = _Pending()
+            if entry.order is not None:
+                entry.order.update(changes)
+            else:
+                entry.changes.update(changes)
+        self._signal()
+        order.update(changes)
+        return order
+
+    def count(self) -> int:
+        with self._lock:
+            new = sum(1 for layer in (self._inflight, self._pending) for entry in layer.values()
+                      if entry.order is not None)
+        return self.storage.count() + new
+
+    def status_counts(self) -> Dict[Optional[str], int]:
+        counts = self.storage.status_counts()
+        buffered = self._buffered_ids()
+        stored = self.storage.get_many(buffered)
+        # Move each buffered order from its stored status to its buffered one
+        for order_id, order in self.get_many(buffered).items():
+            before = stored.get(order_id)
+            if before is not None:
+                counts[before.get("status")] -= 1
+            counts[order.get("status")] = counts.get(order.get("status"), 0) + 1
+        return {status: count for status, count in counts.items() if count}
+
+    def undelivered_ids(self) -> List[str]:
+        undelivered = dict.fromkeys(self.storage.undelivered_ids())
+        with self._lock:
+            buffered = [(order_id, entry) for layer in (self._inflight, self._pending)
+                        for order_id, entry in layer.items()]
+        for order_id, entry in buffered:
+            status = (entry.order if entry.order is not None else entry.changes).get("status")
+            if status == "delivered":
+                undelivered.pop(order_id, None)
+            elif status is not None or entry.order is not None:
+                undelivered[order_id] = None
+        return list(undelivered)
+
+    def compact(self, archive_before: str, drop_before: Optional[str] = None) -> Tuple[int, int]:
+        return self.storage.compact(archive_before, drop_before)
+
+    def memory_stats(self) -> Dict[str, int]:
+        stats = dict(self.storage.memory_stats())
+        stats["buffered_orders"] = len(self._pending) + len(self._inflight)
+        stats["failed_flushes"] = self.failures
+        return stats
+
+    def close(self):
+        self.storage.close()
+
+    # Flushing
+
+    def _signal(self):
+        # Called from request handlers, possibly off the loop thread
+        size = len(self._pending)
+        if size == 1:
+            self._loop.call_soon_threadsafe(self._has_pending.set)
+        if size >= self.batch_size:
+            self._loop.call_soon_threadsafe(self._full.set)
+
+    async def _run(self):
+        while not self._stopping:
+            await self._has_pending.wait()
+            if self.failures and not self._stopping:
+                # Back off after failed flushes; stop() still flushes right away
+                try:
+                    await asyncio.wait_for(self._stop_requested.wait(), self.retry_delay())
+                except asyncio.TimeoutError:
+                    pass
+            elif not self._stopping:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            await self.flush()
+
+    async def flush(self):
+        """Write every buffered order to storage as one batch"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+        if self._task is not None and not self._stopping:
+            self._has_pending.clear()
+            self._full.clear()
+        if not batch:
+            return
+        writes: List[Tuple] = [entry.write(order_id) for order_id, entry in batch.items()]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(None, self.storage.apply_batch, writes)
+        except Exception:
+            self.failures += 1
+            # Log the first failure and the one that makes the buffer unhealthy, not every retry
+            if self.failures == 1 or self.failures == self.max_failures:
+                logger.exception("Order write-behind flush failed %d time(s) in a row; %d orders kept, "
+                                 "retrying in %.2fs", self.failures, len(batch), self.retry_delay())
+            self._requeue(batch)
+        else:
+            if self.failures >= self.max_failures:
+                logger.info("Order write-behind flushing again after %d failed flushes", self.failures)
+            self.failures = 0
+            for order_id, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.error("Order write-behind dropped write for %s: %s", order_id, result)
+            self.flushes += 1
+            self.flushed_writes += len(writes)
+        finally:
+            with self._lock:
+                self._inflight = {}
+        if self._loop is not None:
+            async with self._space:
+                self._space.notify_all()
+
+    def _requeue(self, batch: Dict[str, _Pending]):
+        # Newer buffered writes stay on top of the failed, older ones
+        with self._lock:
+            for order_id, newer in self._pending.items():
+                older = batch.get(order_id)
+                if older is None:
+                    batch[order_id] = newer
+                elif newer.order is not None:
+                    batch[order_id] = newer
+                elif older.order is not None:
+                    older.order.update(newer.changes)
+                else:
+                    older.changes.update(newer.changes)
+            self._pending = batch
+        if self._task is not None:
+            self._has_pending.set()